@@ -10,20 +10,38 @@ from flask_jwt_extended import (
     jwt_required, get_jwt_identity, get_jwt
 )
 
+from config import config_by_name
+from util.cache import CatalogueCache
+from util.database import ReplicaRouter, RoutingSession, init_sqlite_pragmas
+from util.metrics import init_metrics
+from util.passwords import PasswordHasher
+from util.profiling import QueryProfiler
+from util.ratelimit import RateLimiter
+
 
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///app.db'
+app.config.from_object(config_by_name[os.environ.get('APP_CONFIG', 'production')])
 
+init_sqlite_pragmas(app)
 
-db = SQLAlchemy(app)
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 migrate = Migrate(app, db)
 
-app.config["JWT_SECRET_KEY"] = "change-me"
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = timedelta(minutes=30)
-app.config["JWT_REFRESH_TOKEN_EXPIRES"] = timedelta(days=7)
-
 jwt = JWTManager(app)
 
+# First before_request hook, so throttled requests do no other work
+rate_limiter = RateLimiter(app)
+
+catalogue_cache = CatalogueCache(app)
+
+password_hasher = PasswordHasher(app)
+
+replica_router = ReplicaRouter(app)
+
+query_profiler = QueryProfiler(app)
+
+init_metrics(app, db)
+
 
 
 import model
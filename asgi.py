@@ -0,0 +1,13 @@
+"""ASGI entry point.
+
+    uvicorn asgi:asgi_app --workers 4
+
+The Flask app runs unchanged behind a2wsgi's WSGI adapter: the event loop
+accepts connections and streams bodies while requests run on a pool of
+ASGI_THREADS threads per worker.
+"""
+from a2wsgi import WSGIMiddleware
+
+from app import app
+
+asgi_app = WSGIMiddleware(app, workers=app.config.get('ASGI_THREADS', 10))
@@ -0,0 +1,94 @@
+"""Per-request cost of the admin check, old style vs @admin_required.
+
+Serves the same empty view behind no auth, behind jwt_required() plus
+json.loads(get_jwt_identity()) as the admin routes used to do, and behind
+@admin_required reading the role claim, then times each through the test
+client. The view also asks for the role several times to show the memoized
+lookup.
+
+    python bench/auth_overhead.py --requests 20000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from flask import Flask, jsonify
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity, jwt_required
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from util.auth import admin_required, is_admin
+
+CHECKS_PER_REQUEST = 5
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config['JWT_SECRET_KEY'] = 'bench-secret-key-of-at-least-32-bytes'
+    JWTManager(app)
+
+    @app.get('/none')
+    def no_auth():
+        return jsonify({}), 200
+
+    @app.get('/old')
+    @jwt_required()
+    def old_style():
+        for _ in range(CHECKS_PER_REQUEST):
+            current_user = json.loads(get_jwt_identity())
+            if current_user.get('role') != 'admin':
+                return jsonify({'message': 'Admin access required'}), 403
+        return jsonify({}), 200
+
+    @app.get('/new')
+    @admin_required
+    def new_style():
+        for _ in range(CHECKS_PER_REQUEST - 1):
+            if not is_admin():
+                return jsonify({'message': 'Admin access required'}), 403
+        return jsonify({}), 200
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=20000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        old_token = create_access_token(identity=json.dumps({'id': 1, 'role': 'admin'}))
+        new_token = create_access_token(identity='admin:1', additional_claims={'role': 'admin'})
+
+    client = app.test_client()
+    cases = (
+        ('no auth', '/none', None),
+        ('json identity', '/old', old_token),
+        ('admin_required', '/new', new_token),
+    )
+
+    # Interleave the cases in short rounds and keep each one's best round,
+    # so background noise on the box hits all of them alike
+    timings = {name: float('inf') for name, _, _ in cases}
+    per_round = max(1, args.requests // args.rounds)
+    for _ in range(args.rounds):
+        for name, path, token in cases:
+            headers = {'Authorization': f'Bearer {token}'} if token else {}
+            started = time.perf_counter()
+            for _ in range(per_round):
+                response = client.get(path, headers=headers)
+            elapsed = (time.perf_counter() - started) / per_round * 1e6
+            assert response.status_code == 200, response.get_json()
+            timings[name] = min(timings[name], elapsed)
+
+    base = timings['no auth']
+    for name, micros in timings.items():
+        print(f'{name:15} {micros:8.1f} us/request  auth overhead {micros - base:6.1f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Concurrent checkout-style writes against SQLite, default vs configured engine.
+
+Writer processes add a cart row and decrement stock in one transaction while
+reader processes scan the product table. The "default" profile is a bare
+create_engine(); "tuned" uses engine_options() and SQLITE_PRAGMAS from
+config.py, the same settings the app runs with.
+
+    python bench/concurrent_writes.py --writers 16 --readers 8
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config, engine_options
+
+SCHEMA = '''
+CREATE TABLE product (id INTEGER PRIMARY KEY, title VARCHAR(128), stock INTEGER NOT NULL);
+CREATE TABLE cart (
+    id INTEGER PRIMARY KEY, qty INTEGER NOT NULL,
+    product_id INTEGER NOT NULL, customer_id INTEGER NOT NULL
+);
+'''
+
+
+def make_engine(path, profile):
+    url = f'sqlite:///{path}'
+    if profile == 'default':
+        return create_engine(url)
+
+    engine = create_engine(url, **engine_options(url))
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in Config.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    return engine
+
+
+def writer(path, profile, count, products, results):
+    engine = make_engine(path, profile)
+    done = errors = 0
+    for i in range(count):
+        product_id = i % products + 1
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    text('INSERT INTO cart (qty, product_id, customer_id) VALUES (1, :p, :c)'),
+                    {'p': product_id, 'c': os.getpid()}
+                )
+                connection.execute(text('SELECT stock FROM product WHERE id = :p'), {'p': product_id}).fetchall()
+                # Stand-in for the request work done while the transaction is open
+                time.sleep(0.002)
+                connection.execute(text('UPDATE product SET stock = stock - 1 WHERE id = :p'), {'p': product_id})
+            done += 1
+        except OperationalError:
+            errors += 1
+    results.put(('write', done, errors))
+
+
+def reader(path, profile, count, results):
+    engine = make_engine(path, profile)
+    done = errors = 0
+    for _ in range(count):
+        try:
+            with engine.connect() as connection:
+                connection.execute(text('SELECT * FROM product ORDER BY id')).fetchall()
+            done += 1
+        except OperationalError:
+            errors += 1
+    results.put(('read', done, errors))
+
+
+def run(profile, args):
+    path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    connection = sqlite3.connect(path)
+    connection.executescript(SCHEMA)
+    connection.executemany(
+        'INSERT INTO product (id, title, stock) VALUES (?, ?, 1000000)',
+        ((i, f'Product {i}') for i in range(1, args.products + 1))
+    )
+    connection.commit()
+    connection.close()
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=writer, args=(path, profile, args.writes, 100, results))
+        for _ in range(args.writers)
+    ] + [
+        multiprocessing.Process(target=reader, args=(path, profile, args.reads, results))
+        for _ in range(args.readers)
+    ]
+
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    totals = {'write': [0, 0], 'read': [0, 0]}
+    for _ in processes:
+        kind, done, errors = results.get()
+        totals[kind][0] += done
+        totals[kind][1] += errors
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+
+    print(
+        f'{profile:8} {elapsed:7.1f}s  '
+        f'writes {totals["write"][0]:6} ok {totals["write"][1]:5} locked  '
+        f'reads {totals["read"][0]:6} ok {totals["read"][1]:5} locked'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--writers', type=int, default=16)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=200, help='transactions per writer')
+    parser.add_argument('--reads', type=int, default=100, help='scans per reader')
+    parser.add_argument('--products', type=int, default=20000)
+    parser.add_argument('--profile', choices=('default', 'tuned', 'both'), default='both')
+    args = parser.parse_args()
+
+    for profile in ('default', 'tuned'):
+        if args.profile in (profile, 'both'):
+            run(profile, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""Lookup latency before and after the c7ebdaa8f9a3 index migration.
+
+Seeds a throwaway SQLite database with the app schema, times the lookups the
+routes perform, creates the indexes from the migration and times them again.
+
+    python bench/index_lookup.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+SCHEMA = '''
+CREATE TABLE category (id INTEGER PRIMARY KEY, name VARCHAR(128) NOT NULL);
+CREATE TABLE customer (id INTEGER PRIMARY KEY, username VARCHAR(128), password VARCHAR(128));
+CREATE TABLE product (
+    id INTEGER PRIMARY KEY, title VARCHAR(128) NOT NULL, price FLOAT NOT NULL,
+    cost FLOAT NOT NULL, stock INTEGER NOT NULL, description TEXT,
+    image VARCHAR(255), category_id INTEGER NOT NULL REFERENCES category (id)
+);
+CREATE TABLE cart (
+    id INTEGER PRIMARY KEY, qty INTEGER NOT NULL,
+    product_id INTEGER NOT NULL REFERENCES product (id),
+    customer_id INTEGER NOT NULL REFERENCES customer (id)
+);
+CREATE TABLE "order" (
+    id INTEGER PRIMARY KEY, date_time DATETIME, total FLOAT NOT NULL,
+    paid BOOLEAN, paid_by VARCHAR(128), status VARCHAR(50),
+    customer_id INTEGER NOT NULL REFERENCES customer (id)
+);
+CREATE TABLE order_detail (
+    id INTEGER PRIMARY KEY, qty INTEGER NOT NULL, cost FLOAT NOT NULL,
+    price FLOAT NOT NULL, order_id INTEGER NOT NULL REFERENCES "order" (id),
+    product_id INTEGER NOT NULL REFERENCES product (id)
+);
+'''
+
+INDEXES = '''
+CREATE INDEX ix_customer_username ON customer (username);
+CREATE UNIQUE INDEX ix_category_name ON category (name);
+CREATE INDEX ix_product_title ON product (title);
+CREATE INDEX ix_product_category_id ON product (category_id);
+CREATE UNIQUE INDEX ix_cart_customer_id_product_id ON cart (customer_id, product_id);
+CREATE INDEX ix_cart_product_id ON cart (product_id);
+CREATE INDEX ix_order_customer_id_date_time ON "order" (customer_id, date_time);
+CREATE INDEX ix_order_detail_order_id ON order_detail (order_id);
+CREATE INDEX ix_order_detail_product_id ON order_detail (product_id);
+'''
+
+# (label, SQL, function returning the bind parameters for one call)
+LOOKUPS = [
+    ('login: customer by username',
+     'SELECT id, password FROM customer WHERE username = ?',
+     lambda n: (f'user{random.randrange(n)}',)),
+    ('create_product: product by title',
+     'SELECT id FROM product WHERE title = ? LIMIT 1',
+     lambda n: (f'product {random.randrange(n)}',)),
+    ('create_category: category by name',
+     'SELECT id FROM category WHERE name = ? LIMIT 1',
+     lambda n: (f'category {random.randrange(max(n // 1000, 1))}',)),
+    ('product list: products in category',
+     'SELECT id FROM product WHERE category_id = ? ORDER BY id LIMIT 50',
+     lambda n: (random.randrange(max(n // 1000, 1)) + 1,)),
+    ('cart list: cart by customer',
+     'SELECT id, qty, product_id FROM cart WHERE customer_id = ?',
+     lambda n: (random.randrange(n // 10) + 1,)),
+    ('add_to_cart: cart by customer and product',
+     'SELECT id FROM cart WHERE customer_id = ? AND product_id = ? LIMIT 1',
+     lambda n: (random.randrange(n // 10) + 1, random.randrange(n) + 1)),
+    ('orders: by customer, newest first',
+     'SELECT id FROM "order" WHERE customer_id = ? ORDER BY date_time DESC',
+     lambda n: (random.randrange(n // 10) + 1,)),
+    ('order detail: details by order',
+     'SELECT id, qty, price FROM order_detail WHERE order_id = ?',
+     lambda n: (random.randrange(n) + 1,)),
+]
+
+
+def seed(conn, rows):
+    customers = rows // 10
+    categories = max(rows // 1000, 1)
+    start = datetime(2025, 1, 1)
+
+    conn.executescript(SCHEMA)
+    conn.executemany('INSERT INTO category (id, name) VALUES (?, ?)',
+                     ((i + 1, f'category {i}') for i in range(categories)))
+    conn.executemany('INSERT INTO customer (id, username, password) VALUES (?, ?, ?)',
+                     ((i + 1, f'user{i}', 'x') for i in range(customers)))
+    conn.executemany(
+        'INSERT INTO product (id, title, price, cost, stock, category_id) VALUES (?, ?, ?, ?, ?, ?)',
+        ((i + 1, f'product {i}', 5.0, 3.0, 100, random.randrange(categories) + 1) for i in range(rows)))
+    conn.executemany(
+        'INSERT INTO cart (qty, product_id, customer_id) VALUES (?, ?, ?)',
+        ((1, i + 1, random.randrange(customers) + 1) for i in range(rows)))
+    conn.executemany(
+        'INSERT INTO "order" (id, date_time, total, paid, status, customer_id) VALUES (?, ?, ?, ?, ?, ?)',
+        ((i + 1, start + timedelta(seconds=i), 10.0, 0, 'pending', random.randrange(customers) + 1)
+         for i in range(rows)))
+    conn.executemany(
+        'INSERT INTO order_detail (qty, cost, price, order_id, product_id) VALUES (?, ?, ?, ?, ?)',
+        ((1, 3.0, 5.0, random.randrange(rows) + 1, random.randrange(rows) + 1) for _ in range(rows)))
+    conn.commit()
+
+
+def measure(conn, rows, repeat):
+    results = {}
+    for label, sql, params in LOOKUPS:
+        timings = []
+        for _ in range(repeat):
+            args = params(rows)
+            started = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        results[label] = statistics.median(timings)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000,
+                        help='rows per large table (products, carts, orders, order details)')
+    parser.add_argument('--repeat', type=int, default=20, help='lookups timed per query')
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'))
+
+        started = time.perf_counter()
+        seed(conn, args.rows)
+        print(f'seeded {args.rows:,} rows per table in {time.perf_counter() - started:.1f}s')
+
+        before = measure(conn, args.rows, args.repeat)
+
+        started = time.perf_counter()
+        conn.executescript(INDEXES)
+        conn.execute('ANALYZE')
+        print(f'built indexes in {time.perf_counter() - started:.1f}s\n')
+
+        after = measure(conn, args.rows, args.repeat)
+        conn.close()
+
+    width = max(len(label) for label, _, _ in LOOKUPS)
+    print(f'{"lookup (median ms)":<{width}}  {"before":>10}  {"after":>10}  {"speedup":>9}')
+    for label, _, _ in LOOKUPS:
+        speedup = before[label] / after[label] if after[label] else float('inf')
+        print(f'{label:<{width}}  {before[label]:>10.3f}  {after[label]:>10.3f}  {speedup:>8.0f}x')
+
+
+if __name__ == '__main__':
+    main()
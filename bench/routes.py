@@ -0,0 +1,235 @@
+"""Route benchmark: seeds a synthetic shop and times the main API flows.
+
+Builds a throwaway SQLite database, fills it with the requested number of
+customers, categories, products, carts and orders, then drives each scenario
+through the Flask test client and reports throughput and p50/p95/p99.
+
+    python bench/routes.py                      # compare with bench/baseline.json
+    python bench/routes.py --save-baseline      # record a new baseline
+    python bench/routes.py --products 100000 --requests 500
+
+Exits with status 1 when a scenario's p95 is more than --tolerance slower
+than the baseline (and at least --min-delta ms), runs more SQL statements
+per request, or returns unexpected statuses, so it can gate a deploy.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'bench', 'baseline.json')
+PASSWORD = 'Bench@pass1'
+
+
+def seed(db, args):
+    from sqlalchemy import insert
+    from werkzeug.security import generate_password_hash
+    from model import Cart, Category, Customer, Order, OrderDetail, Product
+
+    rng = random.Random(args.seed)
+    # One hash shared by every customer; hashing each would dominate seeding
+    password = generate_password_hash(PASSWORD)
+
+    db.create_all()
+    db.session.execute(insert(Customer), [
+        {'id': i, 'username': f'customer{i}', 'password': password}
+        for i in range(1, args.customers + 1)
+    ])
+    db.session.execute(insert(Category), [
+        {'id': i, 'name': f'Category {i}'} for i in range(1, args.categories + 1)
+    ])
+
+    prices = {}
+    for start in range(1, args.products + 1, 5000):
+        rows = []
+        for i in range(start, min(start + 5000, args.products + 1)):
+            prices[i] = round(rng.uniform(1, 500), 2)
+            rows.append({
+                'id': i, 'title': f'Product {i}', 'price': prices[i],
+                'cost': round(prices[i] * 0.6, 2), 'stock': 1_000_000,
+                'description': f'Description of product {i}',
+                'category_id': rng.randint(1, args.categories),
+            })
+        db.session.execute(insert(Product), rows)
+
+    db.session.execute(insert(Cart), [
+        {'customer_id': customer_id, 'product_id': rng.randint(1, args.products), 'qty': rng.randint(1, 3)}
+        for customer_id in range(1, min(args.carts, args.customers) + 1)
+    ])
+
+    started = datetime.utcnow() - timedelta(days=365)
+    for start in range(1, args.orders + 1, 5000):
+        orders = []
+        details = []
+        for i in range(start, min(start + 5000, args.orders + 1)):
+            product_id = rng.randint(1, args.products)
+            qty = rng.randint(1, 5)
+            orders.append({
+                'id': i, 'customer_id': rng.randint(1, args.customers),
+                'date_time': started + timedelta(minutes=i), 'total': prices[product_id] * qty,
+                'paid': rng.random() < 0.7, 'status': rng.choice(('pending', 'shipped', 'delivered')),
+            })
+            details.append({
+                'order_id': i, 'product_id': product_id, 'qty': qty,
+                'price': prices[product_id], 'cost': round(prices[product_id] * 0.6, 2),
+            })
+        db.session.execute(insert(Order), orders)
+        db.session.execute(insert(OrderDetail), details)
+
+    db.session.commit()
+
+
+def scenarios(app, args):
+    """Return ``{name: (method, path_for(i), body_for(i), headers_for(i), expected)}``."""
+    from flask_jwt_extended import create_access_token
+    from app import catalogue_cache
+
+    with app.app_context():
+        admin = {'Authorization': 'Bearer ' + create_access_token(
+            identity='admin:1', additional_claims={'role': 'admin'})}
+        tokens = [
+            {'Authorization': 'Bearer ' + create_access_token(
+                identity=str(i), additional_claims={'role': 'customer'})}
+            for i in range(1, args.customers + 1)
+        ]
+
+    rng = random.Random(args.seed)
+    carts = min(args.carts, args.customers)
+
+    def cold_product_list(i):
+        catalogue_cache.invalidate()
+        return f'/product/list?category_id={i % args.categories + 1}'
+
+    return {
+        'login': ('POST', lambda i: '/login',
+                  lambda i: {'username': f'customer{i % args.customers + 1}', 'password': PASSWORD},
+                  lambda i: {}, 200),
+        'product_list': ('GET', lambda i: f'/product/list?category_id={i % args.categories + 1}',
+                         lambda i: None, lambda i: {}, 200),
+        'product_list_uncached': ('GET', cold_product_list, lambda i: None, lambda i: {}, 200),
+        'add_to_cart': ('POST', lambda i: '/api/cart',
+                        lambda i: {'product_id': rng.randint(1, args.products), 'qty': 1},
+                        lambda i: tokens[(carts + i) % args.customers], 200),
+        # Seeded carts belong to the first --carts customers, one checkout each
+        'checkout': ('POST', lambda i: '/api/checkout', lambda i: None,
+                     lambda i: tokens[i % carts], 201),
+        'admin_orders': ('GET', lambda i: '/admin/order?limit=50', lambda i: None, lambda i: admin, 200),
+    }
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(client, scenario, count):
+    from util.profiling import count_queries
+
+    method, path_for, body_for, headers_for, expected = scenario
+    latencies = []
+    errors = 0
+    queries = 0
+    started = time.perf_counter()
+    for i in range(count):
+        request_started = time.perf_counter()
+        with count_queries() as statements:
+            response = client.open(path_for(i), method=method, json=body_for(i), headers=headers_for(i))
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        queries = max(queries, len(statements))
+        if response.status_code != expected:
+            errors += 1
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': count,
+        'rps': round(count / elapsed, 1),
+        'p50': round(percentile(latencies, 0.50), 2),
+        'p95': round(percentile(latencies, 0.95), 2),
+        'p99': round(percentile(latencies, 0.99), 2),
+        'errors': errors,
+        'queries': queries,
+    }
+
+
+def compare(results, baseline, tolerance, min_delta):
+    regressions = []
+    print(f'\n{"scenario":22} {"p95":>9} {"baseline":>9} {"change":>8} {"queries":>8}')
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            print(f'{name:22} {result["p95"]:9.2f} {"-":>9} {"new":>8}')
+            continue
+        change = (result['p95'] - previous['p95']) / previous['p95'] if previous['p95'] else 0
+        flag = ''
+        slower = result['p95'] - previous['p95'] > min_delta
+        more_queries = result['queries'] > previous.get('queries', result['queries'])
+        if (change > tolerance and slower) or more_queries or result['errors'] > previous['errors']:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        queries = f'{previous.get("queries", "-")}->{result["queries"]}'
+        print(f'{name:22} {result["p95"]:9.2f} {previous["p95"]:9.2f} {change:+8.0%} {queries:>8}{flag}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--customers', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--products', type=int, default=10000)
+    parser.add_argument('--carts', type=int, default=500)
+    parser.add_argument('--orders', type=int, default=20000)
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario')
+    parser.add_argument('--only', nargs='*', help='scenarios to run')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed p95 slowdown, 0.25 = 25%%')
+    parser.add_argument('--min-delta', type=float, default=1.0,
+                        help='ignore p95 changes smaller than this many ms (timer noise on fast routes)')
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ.setdefault('APP_CONFIG', 'production')
+    # The scenarios replay hundreds of logins and checkouts from one client
+    os.environ.setdefault('RATELIMIT_ENABLED', '0')
+    sys.path.insert(0, ROOT)
+    from app import app, db
+
+    started = time.perf_counter()
+    with app.app_context():
+        seed(db, args)
+    print(f'seeded {database} in {time.perf_counter() - started:.1f}s')
+
+    client = app.test_client()
+    results = {}
+    print(f'\n{"scenario":22} {"req/s":>8} {"p50":>8} {"p95":>8} {"p99":>8} {"errors":>7} {"queries":>8}')
+    for name, scenario in scenarios(app, args).items():
+        if args.only and name not in args.only:
+            continue
+        count = min(args.requests, args.carts, args.customers) if name == 'checkout' else args.requests
+        result = results[name] = run(client, scenario, count)
+        print(f'{name:22} {result["rps"]:8.1f} {result["p50"]:8.2f} {result["p95"]:8.2f} '
+              f'{result["p99"]:8.2f} {result["errors"]:7} {result["queries"]:8}')
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'\nbaseline written to {args.baseline}')
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_delta)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
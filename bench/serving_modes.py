@@ -0,0 +1,144 @@
+"""Load test of the hot read routes under threaded WSGI and ASGI serving.
+
+Copies the app database, starts the server in each mode on the same port
+and drives product list, cart list and order tracking from concurrent
+keep-alive clients for a fixed duration.
+
+    python bench/serving_modes.py --clients 32 --seconds 20 --workers 4
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    'threaded': lambda port, workers: [
+        sys.executable, '-m', 'flask', '--app', 'app', 'run',
+        '--port', str(port), '--with-threads', '--no-reload', '--no-debugger'
+    ],
+    'asgi': lambda port, workers: [
+        sys.executable, '-m', 'uvicorn', 'asgi:asgi_app',
+        '--port', str(port), '--workers', str(workers), '--log-level', 'warning', '--no-access-log'
+    ],
+}
+
+
+def make_fixtures(database):
+    """Return ``(customer_token, order_id)`` for an order in ``database``."""
+    sys.path.insert(0, ROOT)
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    from app import app, db
+    from flask_jwt_extended import create_access_token
+    from model import Order
+
+    with app.app_context():
+        order = db.session.query(Order).order_by(Order.id).first()
+        if order is None:
+            sys.exit('The database needs at least one order')
+        return create_access_token(identity=str(order.customer_id)), order.id
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'server did not start on port {port}')
+
+
+def client(port, paths, token, stop, latencies, errors):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    headers = {'Authorization': f'Bearer {token}'}
+    number = 0
+    while not stop.is_set():
+        path = paths[number % len(paths)]
+        number += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors.append(response.status)
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+            connection.close()
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(mode, args, env, paths, token):
+    server = subprocess.Popen(
+        MODES[mode](args.port, args.workers), cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for(args.port)
+        stop = threading.Event()
+        latencies = []
+        errors = []
+        threads = [
+            threading.Thread(target=client, args=(args.port, paths, token, stop, latencies, errors))
+            for _ in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies.sort()
+    print(
+        f'{mode:9} {len(latencies) / args.seconds:8.1f} req/s  '
+        f'p50 {statistics.median(latencies):7.1f} ms  '
+        f'p95 {percentile(latencies, 0.95):7.1f} ms  '
+        f'p99 {percentile(latencies, 0.99):7.1f} ms  '
+        f'errors {len(errors)}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=20)
+    parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--database', default=os.path.join(ROOT, 'instance', 'app.db'))
+    parser.add_argument('--mode', choices=('threaded', 'asgi', 'both'), default='both')
+    args = parser.parse_args()
+
+    database = os.path.join(tempfile.mkdtemp(), 'app.db')
+    shutil.copy(args.database, database)
+    token, order_id = make_fixtures(database)
+    paths = ['/product/list', '/api/cart/list', f'/order/{order_id}']
+
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}', APP_CONFIG='production')
+    for mode in ('threaded', 'asgi'):
+        if args.mode in (mode, 'both'):
+            run(mode, args, env, paths, token)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import os
+from datetime import timedelta
+
+SQLITE_BUSY_TIMEOUT_MS = 30000
+
+
+def engine_options(uri, pool_size=5, max_overflow=10, pool_recycle=1800, pool_timeout=30):
+    """SQLALCHEMY_ENGINE_OPTIONS suited to the database behind ``uri``."""
+    if uri.startswith('sqlite'):
+        # pysqlite's own lock wait, in seconds; the busy_timeout pragma matches it
+        return {'connect_args': {'timeout': SQLITE_BUSY_TIMEOUT_MS / 1000}}
+
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_pre_ping': True,
+        'pool_recycle': pool_recycle,
+        'pool_timeout': pool_timeout,
+    }
+
+
+def replica_binds(urls):
+    """SQLALCHEMY_BINDS entries for a comma-separated list of replica URLs."""
+    urls = [url.strip() for url in (urls or '').split(',') if url.strip()]
+    return {
+        f'replica_{number}': {'url': url, **engine_options(url)}
+        for number, url in enumerate(urls, 1)
+    }
+
+
+class Config:
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Read-only requests go to these binds; see util.database.ReplicaRouter.
+    # Two SQLite files work for local testing:
+    # REPLICA_DATABASE_URLS=sqlite:////tmp/replica.db
+    SQLALCHEMY_BINDS = replica_binds(os.environ.get('REPLICA_DATABASE_URLS'))
+    REPLICA_BINDS = list(SQLALCHEMY_BINDS)
+    # Seconds a caller keeps reading from the primary after a write
+    REPLICA_STICKY_SECONDS = 5
+    REPLICA_STICKY_URL = os.environ.get('REPLICA_STICKY_URL')
+
+    # Applied on every new SQLite connection. WAL lets readers run while a
+    # writer commits; busy_timeout makes writers queue instead of failing
+    # with "database is locked".
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': SQLITE_BUSY_TIMEOUT_MS,
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    }
+
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'change-me')
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=30)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=7)
+    # Token buckets per endpoint, by client address and by JWT identity
+    RATE_LIMITS = {
+        'login': {'ip': '10/minute'},
+        'admin_login': {'ip': '5/minute'},
+        'create_customer': {'ip': '5/minute'},
+        'refresh_token': {'ip': '30/minute'},
+        'add_to_cart': {'ip': '120/minute', 'identity': '60/minute'},
+        'checkout': {'ip': '30/minute', 'identity': '10/minute'},
+    }
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', '1') == '1'
+    # Shared buckets for every worker; per-process memory when unset
+    RATELIMIT_STORAGE_URL = os.environ.get('RATELIMIT_STORAGE_URL')
+
+    # Shared store for used and revoked tokens; per-process memory when unset
+    TOKEN_STORE_URL = os.environ.get('TOKEN_STORE_URL')
+    # Bloom filter sizing for the in-process revocation list
+    TOKEN_DENYLIST_CAPACITY = 100_000
+
+    # Cost parameters for new hashes; older hashes are upgraded on login
+    PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    # Hashes queued or running per app process, and how long a request waits for a slot
+    PASSWORD_HASH_CONCURRENCY = 4
+    PASSWORD_HASH_QUEUE_TIMEOUT = 5
+
+    CATALOGUE_CACHE_SIZE = 256
+    CATALOGUE_CACHE_TTL = 60
+    CATALOGUE_CACHE_URL = os.environ.get('CATALOGUE_CACHE_URL')
+
+    # Public prefix for stored image keys, e.g. a CDN; defaults to this host's /uploads/
+    IMAGE_BASE_URL = os.environ.get('IMAGE_BASE_URL')
+
+    # Let the front-end server stream uploads: USE_X_SENDFILE=1 for Apache/lighttpd,
+    # UPLOADS_ACCEL_REDIRECT=/internal-uploads/ for an nginx internal location
+    USE_X_SENDFILE = os.environ.get('USE_X_SENDFILE') == '1'
+    UPLOADS_ACCEL_REDIRECT = os.environ.get('UPLOADS_ACCEL_REDIRECT')
+    UPLOADS_MAX_AGE = 3600
+
+    IMAGE_VARIANT_WORKERS = 2
+    IMAGE_VARIANT_QUALITY = 80
+
+    # Statements slower than this are logged with their endpoint
+    SLOW_QUERY_MS = 200
+
+    # Request threads per worker when served through asgi.py
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 10))
+
+    AUTOCOMPLETE_MAX_ENTRIES = 1_000_000
+    AUTOCOMPLETE_REFRESH_SECONDS = 300
+
+
+class DevelopmentConfig(Config):
+    # Opt in with FLASK_DEBUG=1; enables the interactive debugger and the
+    # X-DB-* query profiler headers
+    DEBUG = os.environ.get('FLASK_DEBUG') == '1'
+
+
+class ProductionConfig(Config):
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        Config.SQLALCHEMY_DATABASE_URI,
+        pool_size=int(os.environ.get('DB_POOL_SIZE', 10)),
+        max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+        pool_recycle=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+    )
+
+
+class TestingConfig(Config):
+    TESTING = True
+    RATELIMIT_ENABLED = False
+    PASSWORD_HASH_WORKERS = 0
+    SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DATABASE_URL', 'sqlite://')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    SQLALCHEMY_BINDS = {}
+    REPLICA_BINDS = []
+
+
+config_by_name = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig,
+    'testing': TestingConfig,
+}
@@ -51,6 +51,20 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Hide the full-text search objects from autogenerate.
+
+    a81c55e2f0b9 creates them with raw SQL (the SQLite FTS5 table and its
+    shadow tables, or the PostgreSQL search_vector column and its index), so
+    they have no model and would otherwise be dropped by the next migration.
+    """
+    if type_ == 'table' and name.startswith('product_fts'):
+        return False
+    if reflected and compare_to is None and name in ('search_vector', 'ix_product_search_vector'):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +79,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +108,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
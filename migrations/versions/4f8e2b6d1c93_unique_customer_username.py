@@ -0,0 +1,43 @@
+"""unique customer username
+
+Revision ID: 4f8e2b6d1c93
+Revises: a81c55e2f0b9
+Create Date: 2026-10-18 15:12:48.204519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8e2b6d1c93'
+down_revision = 'a81c55e2f0b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing duplicates keep their orders and carts: the oldest account keeps
+    # the name and the others become "<username>-<id>".
+    op.execute(
+        "UPDATE customer SET username = username || '-' || id "
+        "WHERE username IS NOT NULL AND id NOT IN ("
+        "SELECT MIN(id) FROM customer WHERE username IS NOT NULL GROUP BY username)"
+    )
+
+    op.drop_index('ix_customer_username', table_name='customer')
+    op.create_index('ix_customer_username', 'customer', ['username'], unique=True)
+
+    # scrypt hashes are longer than 128 characters; SQLite does not enforce lengths
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('customer', 'password', type_=sa.String(length=255),
+                        existing_type=sa.String(length=128))
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('customer', 'password', type_=sa.String(length=128),
+                        existing_type=sa.String(length=255))
+
+    op.drop_index('ix_customer_username', table_name='customer')
+    op.create_index('ix_customer_username', 'customer', ['username'], unique=False)
@@ -0,0 +1,35 @@
+"""normalize product image keys
+
+Revision ID: 5b1e0f3d92aa
+Revises: c7ebdaa8f9a3
+Create Date: 2026-10-18 11:02:17.540921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b1e0f3d92aa'
+down_revision = 'c7ebdaa8f9a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Absolute URLs and /uploads/ paths become the bare filename in uploads/
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, image FROM product WHERE image LIKE '%/%'"
+    )).fetchall()
+
+    if rows:
+        conn.execute(
+            sa.text("UPDATE product SET image = :image WHERE id = :id"),
+            [{'id': row.id, 'image': row.image.split('/uploads/')[-1].lstrip('/')} for row in rows]
+        )
+
+
+def downgrade():
+    # Bare keys are still served from /uploads/, so there is nothing to restore
+    pass
@@ -1,65 +0,0 @@
-"""rename customer table to user
-
-Revision ID: 80109e3648d0
-Revises: 47dfa026e25c
-Create Date: 2026-01-29 22:14:06.768472
-
-"""
-from alembic import op
-import sqlalchemy as sa
-
-
-# revision identifiers, used by Alembic.
-revision = '80109e3648d0'
-down_revision = '47dfa026e25c'
-branch_labels = None
-depends_on = None
-
-
-def upgrade():
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.create_table('user',
-    sa.Column('id', sa.Integer(), nullable=False),
-    sa.Column('username', sa.String(length=128), nullable=True),
-    sa.Column('password', sa.String(length=128), nullable=True),
-    sa.Column('role', sa.String(length=20), nullable=False),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.drop_table('customer')
-    with op.batch_alter_table('cart', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=False))
-        batch_op.drop_constraint(None, type_='foreignkey')
-        batch_op.create_foreign_key(None, 'user', ['user_id'], ['id'])
-        batch_op.drop_column('customer_id')
-
-    with op.batch_alter_table('order', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=False))
-        batch_op.drop_constraint(None, type_='foreignkey')
-        batch_op.create_foreign_key(None, 'user', ['user_id'], ['id'])
-        batch_op.drop_column('customer_id')
-
-    # ### end Alembic commands ###
-
-
-def downgrade():
-    # ### commands auto generated by Alembic - please adjust! ###
-    with op.batch_alter_table('order', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('customer_id', sa.INTEGER(), nullable=False))
-        batch_op.drop_constraint(None, type_='foreignkey')
-        batch_op.create_foreign_key(None, 'customer', ['customer_id'], ['id'])
-        batch_op.drop_column('user_id')
-
-    with op.batch_alter_table('cart', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('customer_id', sa.INTEGER(), nullable=False))
-        batch_op.drop_constraint(None, type_='foreignkey')
-        batch_op.create_foreign_key(None, 'customer', ['customer_id'], ['id'])
-        batch_op.drop_column('user_id')
-
-    op.create_table('customer',
-    sa.Column('id', sa.INTEGER(), nullable=False),
-    sa.Column('username', sa.VARCHAR(length=128), nullable=True),
-    sa.Column('password', sa.VARCHAR(length=128), nullable=True),
-    sa.PrimaryKeyConstraint('id')
-    )
-    op.drop_table('user')
-    # ### end Alembic commands ###
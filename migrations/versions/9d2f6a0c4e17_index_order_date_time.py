@@ -0,0 +1,24 @@
+"""index order date_time
+
+Revision ID: 9d2f6a0c4e17
+Revises: e3a4c1b7d805
+Create Date: 2026-10-18 12:31:52.118430
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d2f6a0c4e17'
+down_revision = 'e3a4c1b7d805'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_order_date_time_id', 'order', ['date_time', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_order_date_time_id', table_name='order')
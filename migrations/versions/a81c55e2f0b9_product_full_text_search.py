@@ -0,0 +1,72 @@
+"""product full text search
+
+Revision ID: a81c55e2f0b9
+Revises: 9d2f6a0c4e17
+Create Date: 2026-10-18 13:40:26.772015
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a81c55e2f0b9'
+down_revision = '9d2f6a0c4e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        # External-content FTS5 index over product; triggers keep it in sync
+        # with every insert, update and delete, including bulk imports.
+        op.execute(
+            "CREATE VIRTUAL TABLE product_fts USING fts5("
+            "title, description, content='product', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER product_fts_ai AFTER INSERT ON product BEGIN "
+            "INSERT INTO product_fts(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER product_fts_ad AFTER DELETE ON product BEGIN "
+            "INSERT INTO product_fts(product_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER product_fts_au AFTER UPDATE OF title, description ON product BEGIN "
+            "INSERT INTO product_fts(product_fts, rowid, title, description) "
+            "VALUES ('delete', old.id, old.title, old.description); "
+            "INSERT INTO product_fts(rowid, title, description) "
+            "VALUES (new.id, new.title, new.description); END"
+        )
+        op.execute("INSERT INTO product_fts(product_fts) VALUES ('rebuild')")
+
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE product ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')) STORED"
+        )
+        op.create_index(
+            'ix_product_search_vector', 'product', ['search_vector'],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS product_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS product_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS product_fts_ai")
+        op.execute("DROP TABLE IF EXISTS product_fts")
+
+    elif dialect == 'postgresql':
+        op.drop_index('ix_product_search_vector', table_name='product')
+        op.drop_column('product', 'search_vector')
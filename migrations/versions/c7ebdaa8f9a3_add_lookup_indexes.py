@@ -0,0 +1,66 @@
+"""add lookup indexes
+
+Revision ID: c7ebdaa8f9a3
+Revises: 47dfa026e25c
+Create Date: 2026-10-18 10:12:41.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7ebdaa8f9a3'
+down_revision = '47dfa026e25c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Merge duplicate cart rows so the (customer_id, product_id) pair can be unique
+    op.execute(
+        'UPDATE cart SET qty = ('
+        ' SELECT SUM(c.qty) FROM cart c'
+        ' WHERE c.customer_id = cart.customer_id AND c.product_id = cart.product_id'
+        ') WHERE id IN (SELECT MIN(id) FROM cart GROUP BY customer_id, product_id)'
+    )
+    op.execute(
+        'DELETE FROM cart WHERE id NOT IN ('
+        ' SELECT MIN(id) FROM cart GROUP BY customer_id, product_id'
+        ')'
+    )
+
+    # Fold duplicate category names into the lowest id so the name can be unique
+    op.execute(
+        'UPDATE product SET category_id = ('
+        ' SELECT MIN(c2.id) FROM category c1 JOIN category c2 ON c2.name = c1.name'
+        ' WHERE c1.id = product.category_id'
+        ') WHERE category_id IS NOT NULL'
+    )
+    op.execute(
+        'DELETE FROM category WHERE id NOT IN ('
+        ' SELECT MIN(id) FROM category GROUP BY name'
+        ')'
+    )
+
+    op.create_index('ix_customer_username', 'customer', ['username'], unique=False)
+    op.create_index('ix_category_name', 'category', ['name'], unique=True)
+    op.create_index('ix_product_title', 'product', ['title'], unique=False)
+    op.create_index('ix_product_category_id', 'product', ['category_id'], unique=False)
+    op.create_index('ix_cart_customer_id_product_id', 'cart', ['customer_id', 'product_id'], unique=True)
+    op.create_index('ix_cart_product_id', 'cart', ['product_id'], unique=False)
+    op.create_index('ix_order_customer_id_date_time', 'order', ['customer_id', 'date_time'], unique=False)
+    op.create_index('ix_order_detail_order_id', 'order_detail', ['order_id'], unique=False)
+    op.create_index('ix_order_detail_product_id', 'order_detail', ['product_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_order_detail_product_id', table_name='order_detail')
+    op.drop_index('ix_order_detail_order_id', table_name='order_detail')
+    op.drop_index('ix_order_customer_id_date_time', table_name='order')
+    op.drop_index('ix_cart_product_id', table_name='cart')
+    op.drop_index('ix_cart_customer_id_product_id', table_name='cart')
+    op.drop_index('ix_product_category_id', table_name='product')
+    op.drop_index('ix_product_title', table_name='product')
+    op.drop_index('ix_category_name', table_name='category')
+    op.drop_index('ix_customer_username', table_name='customer')
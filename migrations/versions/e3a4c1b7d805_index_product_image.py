@@ -0,0 +1,25 @@
+"""index product image
+
+Revision ID: e3a4c1b7d805
+Revises: 5b1e0f3d92aa
+Create Date: 2026-10-18 11:48:05.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a4c1b7d805'
+down_revision = '5b1e0f3d92aa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Content-addressed images are shared; releasing one looks up other users by key
+    op.create_index('ix_product_image', 'product', ['image'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_product_image', table_name='product')
@@ -2,12 +2,15 @@ from app import db
 
 class Cart(db.Model):
     __tablename__ = "cart"
+    __table_args__ = (
+        db.Index("ix_cart_customer_id_product_id", "customer_id", "product_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     qty = db.Column(db.Integer, nullable=False)
 
     product_id = db.Column(
-        db.Integer, db.ForeignKey("product.id"), nullable=False
+        db.Integer, db.ForeignKey("product.id"), nullable=False, index=True
     )
     customer_id = db.Column(
         db.Integer, db.ForeignKey("customer.id"), nullable=False
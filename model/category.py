@@ -4,6 +4,6 @@ class Category(db.Model):
     __tablename__ = "category"
 
     id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(128), nullable=False)
+    name = db.Column(db.String(128), nullable=False, unique=True, index=True)
 
     products = db.relationship("Product", backref="category", lazy=True)
\ No newline at end of file
@@ -5,6 +5,10 @@ from app import db
 
 class Order(db.Model):
     __tablename__ = "order"
+    __table_args__ = (
+        db.Index("ix_order_customer_id_date_time", "customer_id", "date_time"),
+        db.Index("ix_order_date_time_id", "date_time", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     date_time = db.Column(db.DateTime, default=datetime.utcnow)
@@ -9,8 +9,8 @@ class OrderDetail(db.Model):
     price = db.Column(db.Float, nullable=False)
 
     order_id = db.Column(
-        db.Integer, db.ForeignKey("order.id"), nullable=False
+        db.Integer, db.ForeignKey("order.id"), nullable=False, index=True
     )
     product_id = db.Column(
-        db.Integer, db.ForeignKey("product.id"), nullable=False
+        db.Integer, db.ForeignKey("product.id"), nullable=False, index=True
     )
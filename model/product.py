@@ -4,15 +4,15 @@ class Product(db.Model):
     __tablename__ = "product"
 
     id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(128), nullable=False)
+    title = db.Column(db.String(128), nullable=False, index=True)
     price = db.Column(db.Float, nullable=False)
     cost = db.Column(db.Float, nullable=False)
     stock = db.Column(db.Integer, nullable=False)
     description = db.Column(db.Text)
-    image = db.Column(db.String(255))
+    image = db.Column(db.String(255), index=True)
 
     category_id = db.Column(
-        db.Integer, db.ForeignKey("category.id"), nullable=False
+        db.Integer, db.ForeignKey("category.id"), nullable=False, index=True
     )
 
     carts = db.relationship("Cart", backref="product", lazy=True)
@@ -4,4 +4,7 @@ from route.api.category import *
 from route.api.product import *
 from route.api.cart import *
 from route.api.checkout import *
-from route.api.order import *
\ No newline at end of file
+from route.api.order import *
+from route.api.export import *
+from route.api.metrics import *
+from route.cli import *
@@ -1,14 +1,46 @@
-import json
 import re
 
 from flask import request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
+from flask_jwt_extended import (
+    create_access_token, create_refresh_token, decode_token, jwt_required, get_jwt_identity, get_jwt
+)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from sqlalchemy import false
-from werkzeug.security import check_password_hash
+from sqlalchemy.exc import IntegrityError
 
-from app import app, db, jwt
+from app import app, db, jwt, password_hasher
 from model.customer import Customer
-from werkzeug.security import check_password_hash, generate_password_hash
+from util.auth import admin_required
+from util.tokens import expiring_set
+
+# JTIs of refresh tokens already exchanged; each one can be used once
+used_refresh_tokens = expiring_set(app, 'used-refresh')
+# JTIs of tokens revoked by logout, kept until they would have expired
+revoked_tokens = expiring_set(app, 'revoked', bloom=True)
+
+
+@jwt.token_in_blocklist_loader
+def is_token_revoked(jwt_header, jwt_payload):
+    return jwt_payload['jti'] in revoked_tokens
+
+
+def revoke_current_tokens():
+    """Revoke the request's token and the refresh_token in the body, if any."""
+    claims = get_jwt()
+    revoked_tokens.add(claims['jti'], claims['exp'])
+
+    data = request.get_json(silent=True) or {}
+    refresh = data.get('refresh_token')
+    if not refresh:
+        return
+    try:
+        refresh_claims = decode_token(refresh, allow_expired=True)
+    except (PyJWTError, JWTExtendedException):
+        return
+    # Only the owner of the refresh token can revoke it
+    if refresh_claims.get('sub') == claims['sub']:
+        revoked_tokens.add(refresh_claims['jti'], refresh_claims['exp'])
 
 def is_valid_password(password):
     errors = []
@@ -40,7 +72,7 @@ def create_customer():
     if not customer:
         return jsonify({'message': 'No user provided!'}), 400
 
-    username = customer.get('username')
+    username = (customer.get('username') or '').strip()
     password = customer.get('password')
 
 
@@ -55,9 +87,17 @@ def create_customer():
 
 
 
-    customer_obj = Customer(username=username, password=generate_password_hash(password))
+    if Customer.query.filter_by(username=username).first():
+        return jsonify({'message': 'Username is already taken'}), 409
+
+    customer_obj = Customer(username=username, password=password_hasher.hash(password))
     db.session.add(customer_obj)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Taken by a concurrent signup between the check and the insert
+        db.session.rollback()
+        return jsonify({'message': 'Username is already taken'}), 409
 
 
 
@@ -76,26 +116,27 @@ def login():
     username = (data.get("username") or "").strip()
     password = data.get("password") or ""
 
-    customers = Customer.query.filter_by(username=username).all()
+    customer = Customer.query.filter_by(username=username).first()
 
-    if not customers:
+    if not customer or not password_hasher.verify(customer.password, password):
         return jsonify({'message': 'Invalid username or password'}), 401
 
-    for customer in customers:
-        if check_password_hash(customer.password, password):
-            access = create_access_token(identity=str(customer.id))
-            return jsonify({
-                'message': 'Login successful',
-                'access_token': access
-            }), 200
+    if password_hasher.needs_rehash(customer.password):
+        customer.password = password_hasher.hash(password)
+        db.session.commit()
 
-    return jsonify({'message': 'Invalid username or password'}), 401
+    identity = str(customer.id)
+    claims = {'role': 'customer'}
+    return jsonify({
+        'message': 'Login successful',
+        'access_token': create_access_token(identity=identity, additional_claims=claims),
+        'refresh_token': create_refresh_token(identity=identity, additional_claims=claims)
+    }), 200
 
 @app.post('/logout')
 @jwt_required()
 def logout():
-    customer_id = get_jwt_identity()
-    claims = get_jwt()
+    revoke_current_tokens()
 
     return jsonify({
         "message": "Logout successful"
@@ -112,23 +153,36 @@ def admin_login():
     password = data.get('password')
 
     if username == ADMIN_USERNAME and password == ADMIN_PASSWORD:
-        token = create_access_token(identity=json.dumps({"id": 1, "role": "admin"}))
-        return {"token": token}, 200
+        # Kept apart from customer ids, which are plain numbers
+        identity = "admin:1"
+        claims = {"role": "admin"}
+        return {
+            "token": create_access_token(identity=identity, additional_claims=claims),
+            "refresh_token": create_refresh_token(identity=identity, additional_claims=claims)
+        }, 200
 
     return {"message": "Invalid username or password"}, 401
 
-@app.post('/admin/logout')
-@jwt_required()
-def admin_logout():
-    identity = get_jwt_identity()
-
-    if not isinstance(identity, str):
-        return jsonify({'message': 'Admin access required'}), 403
+@app.post('/token/refresh')
+@jwt_required(refresh=True)
+def refresh_token():
+    # The refresh token already carries the identity, so no DB lookup or
+    # password check; it is rotated and the old one cannot be reused.
+    claims = get_jwt()
+    if not used_refresh_tokens.add(claims['jti'], claims['exp']):
+        return jsonify({'message': 'Refresh token has already been used'}), 401
 
-    admin = json.loads(identity)
+    identity = get_jwt_identity()
+    role = {'role': claims.get('role')}
+    return jsonify({
+        'access_token': create_access_token(identity=identity, additional_claims=role),
+        'refresh_token': create_refresh_token(identity=identity, additional_claims=role)
+    }), 200
 
-    if admin.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
+@app.post('/admin/logout')
+@admin_required
+def admin_logout():
+    revoke_current_tokens()
 
     return jsonify({
         "message": "Logout successful"
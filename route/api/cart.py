@@ -2,6 +2,7 @@ from urllib import request
 
 from flask import Flask, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.exc import IntegrityError
 
 from app import app, db
 from model import Product, Cart
@@ -59,7 +60,20 @@ def add_to_cart():
         )
         db.session.add(cart_item)
 
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request inserted the same (customer, product) row first
+        db.session.rollback()
+        cart_item = Cart.query.filter_by(
+            customer_id=customer_id,
+            product_id=product_id
+        ).first()
+        if cart_item is None:
+            # ...and it was removed again, e.g. by a checkout clearing the cart
+            return jsonify({'message': 'Cart changed during the request, please try again'}), 409
+        cart_item.qty += qty
+        db.session.commit()
 
     return jsonify({
         'cart_item': {
@@ -75,18 +89,20 @@ def add_to_cart():
 @jwt_required()
 def get_cart_list():
     customer_id = get_jwt_identity()
-    cart_items = Cart.query.filter_by(customer_id=customer_id).all()
+    cart_items = (
+        db.session.query(Cart, Product)
+        .join(Product, Cart.product_id == Product.id)
+        .filter(Cart.customer_id == customer_id)
+        .order_by(Cart.id)
+        .all()
+    )
     if not cart_items:
         return jsonify({
             'message': 'Cart is empty',
         }), 200
 
     cart_list = []
-    for item in cart_items:
-        product = Product.query.get(item.product_id)
-        if not product:
-            continue
-
+    for item, product in cart_items:
         cart_list.append({
             'cart_id': item.id,
             'product': product.title,
@@ -1,18 +1,14 @@
-import json
-
-from flask_jwt_extended import get_jwt_identity, jwt_required
-
-from app import app,db
+from app import app, db, catalogue_cache
 from flask import request, jsonify
 from model import Category
+from sqlalchemy.exc import IntegrityError
+from util.auth import admin_required
+from util.autocomplete import autocomplete_index
 
 
 @app.post('/admin/category/create')
-@jwt_required()
+@admin_required
 def create_category():
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
     data = request.get_json()
 
     name = data.get('name')
@@ -24,7 +20,15 @@ def create_category():
 
     category = Category(name=name)
     db.session.add(category)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Created by a concurrent request between the check and the insert
+        db.session.rollback()
+        return jsonify({'message': 'Category already exists'}), 409
+    # A cached "Category not found" for this name is now stale
+    catalogue_cache.invalidate()
+    autocomplete_index.add('category', category.id, category.name)
 
     return jsonify({
         'message': 'Category created successfully',
@@ -34,14 +38,10 @@ def create_category():
         }
     }), 201
 
+
 @app.get('/admin/category/list/')
-@jwt_required()
+@admin_required
 def get_categories():
-    current_user = json.loads(get_jwt_identity())
-
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     categories = Category.query.all()
 
     if not categories:
@@ -58,11 +58,8 @@ def get_categories():
 
 
 @app.put('/admin/category/update/<int:category_id>')
-@jwt_required()
+@admin_required
 def update_category(category_id):
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
     data = request.get_json()
     category = Category.query.get(category_id)
     if not category:
@@ -86,7 +83,15 @@ def update_category(category_id):
         }), 400
 
     category.name = name
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({
+            'message': f"Category '{name}' already exists"
+        }), 409
+    catalogue_cache.invalidate()
+    autocomplete_index.add('category', category.id, category.name)
 
     return jsonify({
         'message': 'Category updated successfully',
@@ -97,13 +102,8 @@ def update_category(category_id):
     })
 
 @app.delete('/admin/category/delete/<int:category_id>')
-@jwt_required()
+@admin_required
 def delete_category(category_id):
-    current_user = json.loads(get_jwt_identity())
-
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     category = Category.query.get(category_id)
     if not category:
         return jsonify({'message': 'Category not found'}), 404
@@ -116,5 +116,7 @@ def delete_category(category_id):
 
     db.session.delete(category)
     db.session.commit()
+    catalogue_cache.invalidate()
+    autocomplete_index.remove('category', category_id)
 
     return jsonify({'message': 'Category deleted successfully'}), 200
@@ -1,10 +1,26 @@
 from flask import Flask, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import case, insert, select, update
 
 from app import app, db
 from model import Product, Cart, Order, OrderDetail
 
 
+def insufficient_stock_response(quantities, titles, stock):
+    """Build the 400 for cart lines that exceed ``stock`` (product id -> units)."""
+    short_items = [{
+        'product_id': product_id,
+        'product': titles[product_id],
+        'requested': qty,
+        'available': stock.get(product_id, 0)
+    } for product_id, qty in quantities.items() if qty > stock.get(product_id, 0)]
+
+    return jsonify({
+        'message': 'Insufficient stock for ' + ', '.join(i['product'] for i in short_items),
+        'items': short_items
+    }), 400
+
+
 @app.post('/api/checkout')
 @jwt_required()
 def checkout():
@@ -14,26 +30,51 @@ def checkout():
     if not cart_items:
         return jsonify({'message': 'Cart is empty'}), 400
 
-    total = 0
-    order_details = []
-
+    quantities = {}
     for item in cart_items:
-        product = Product.query.get(item.product_id)
-        if not product:
-            return jsonify({'message': 'Product not found'}), 404
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.qty
+
+    products = {
+        p.id: p for p in Product.query.filter(Product.id.in_(quantities)).all()
+    }
 
-        if item.qty > product.stock:
-            return jsonify({
-                'message': f'Insufficient stock for {product.title}'
-            }), 400
+    missing = [product_id for product_id in quantities if product_id not in products]
+    if missing:
+        return jsonify({
+            'message': 'Product not found',
+            'product_ids': missing
+        }), 404
 
-        subtotal = product.price * item.qty
-        total += subtotal
+    # Plain values: the ORM objects expire if the UPDATE below is rolled back
+    titles = {product_id: p.title for product_id, p in products.items()}
+    stock = {product_id: p.stock for product_id, p in products.items()}
+    if any(qty > stock[product_id] for product_id, qty in quantities.items()):
+        return insufficient_stock_response(quantities, titles, stock)
 
-        order_details.append({
-            'product': product,
-            'qty': item.qty
-        })
+    # Decrement every product in one conditional UPDATE; a row whose stock was
+    # taken by a concurrent checkout fails the WHERE clause and is not counted.
+    result = db.session.execute(
+        update(Product)
+        .where(
+            Product.id.in_(quantities),
+            Product.stock >= case(quantities, value=Product.id)
+        )
+        .values(stock=Product.stock - case(quantities, value=Product.id))
+        .execution_options(synchronize_session=False)
+    )
+
+    if result.rowcount != len(quantities):
+        db.session.rollback()
+        # Report against current stock; a product deleted meanwhile counts as 0
+        stock = dict(db.session.execute(
+            select(Product.id, Product.stock).where(Product.id.in_(quantities))
+        ).all())
+        if all(qty <= stock.get(product_id, 0) for product_id, qty in quantities.items()):
+            # Stock came back between the UPDATE and this read
+            return jsonify({'message': 'Stock changed during checkout, please try again'}), 409
+        return insufficient_stock_response(quantities, titles, stock)
+
+    total = sum(products[product_id].price * qty for product_id, qty in quantities.items())
 
     order = Order(
         customer_id=customer_id,
@@ -44,17 +85,13 @@ def checkout():
     db.session.add(order)
     db.session.flush()  # get order.id before commit
 
-    for item in order_details:
-        detail = OrderDetail(
-            order_id=order.id,
-            product_id=item['product'].id,
-            qty=item['qty'],
-            cost=item['product'].cost,
-            price=item['product'].price
-        )
-        db.session.add(detail)
-
-        item['product'].stock -= item['qty']
+    db.session.execute(insert(OrderDetail), [{
+        'order_id': order.id,
+        'product_id': product_id,
+        'qty': qty,
+        'cost': products[product_id].cost,
+        'price': products[product_id].price
+    } for product_id, qty in quantities.items()])
 
     Cart.query.filter_by(customer_id=customer_id).delete()
 
@@ -1,14 +1,13 @@
-import json
 import re
 
-from werkzeug.security import generate_password_hash
+from sqlalchemy.exc import IntegrityError
 
-from app import app, db
+from app import app, db, password_hasher
 from flask import request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
 
 from model import Customer
 from route.api.auth import is_valid_password
+from util.auth import admin_required
 
 def is_valid_password(password):
     errors = []
@@ -36,13 +35,8 @@ def is_valid_password(password):
 
 
 @app.get('/admin/customer/list')
-@jwt_required()
+@admin_required
 def admin_get_customers():
-    current_user = json.loads(get_jwt_identity())
-
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     customers = Customer.query.all()
 
     if not customers:
@@ -61,16 +55,11 @@ def admin_get_customers():
     }), 200
 
 @app.post('/admin/create-customer')
-@jwt_required()
+@admin_required
 def admin_create_customer():
-    current_user = json.loads(get_jwt_identity())
-
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     data = request.get_json()
 
-    username = data.get('username')
+    username = (data.get('username') or '').strip()
     password = data.get('password')
 
     if not username:
@@ -83,12 +72,19 @@ def admin_create_customer():
         return jsonify({'message': password_error}), 400
 
 
+    if Customer.query.filter_by(username=username).first():
+        return jsonify({'message': 'Username is already taken'}), 409
+
     customer_obj = Customer(
         username=username,
-        password=generate_password_hash(password)
+        password=password_hasher.hash(password)
     )
     db.session.add(customer_obj)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'Username is already taken'}), 409
 
     return {
         'message': 'Customer created successfully',
@@ -100,7 +96,7 @@ def admin_create_customer():
 
 
 
-    customer_obj = Customer(username=username, password=generate_password_hash(password))
+    customer_obj = Customer(username=username, password=password_hasher.hash(password))
     db.session.add(customer_obj)
     db.session.commit()
 
@@ -117,13 +113,8 @@ def admin_create_customer():
     }
 
 @app.put('/admin/customer/update/<int:customer_id>')
-@jwt_required()
+@admin_required
 def admin_update_customer(customer_id):
-
-    current_user = json.loads(get_jwt_identity())
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     customer = Customer.query.get(customer_id)
     if not customer:
         return jsonify({'message': 'Customer not found'}), 404
@@ -136,15 +127,25 @@ def admin_update_customer(customer_id):
     password = data.get('password')
 
     if username:
-        customer.username = username.strip()
+        username = username.strip()
+        taken = Customer.query.filter(
+            Customer.username == username, Customer.id != customer.id
+        ).first()
+        if taken:
+            return jsonify({'message': 'Username is already taken'}), 409
+        customer.username = username
 
     if password:
         password_error = is_valid_password(password)
         if password_error:
             return jsonify({'message': password_error}), 400
-        customer.password = generate_password_hash(password)
+        customer.password = password_hasher.hash(password)
 
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'Username is already taken'}), 409
 
     return jsonify({
         'message': 'Customer updated successfully',
@@ -155,14 +156,8 @@ def admin_update_customer(customer_id):
     }), 200
 
 @app.delete('/admin/customer/delete/<int:customer_id>')
-@jwt_required()
+@admin_required
 def admin_delete_customer(customer_id):
-    identity = get_jwt_identity()
-    current_user = json.loads(identity) if isinstance(identity, str) else identity
-
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     customer = Customer.query.get(customer_id)
     if not customer:
         return jsonify({'message': 'Customer not found'}), 404
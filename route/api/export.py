@@ -0,0 +1,72 @@
+from datetime import datetime
+
+from flask import request, jsonify
+from sqlalchemy import select
+
+from app import app, db
+from model import Customer, Order, OrderDetail, Product
+from util.auth import admin_required
+from util.params import parse_bool
+from util.streaming import csv_lines, ndjson_lines, stream_response
+
+EXPORT_BATCH_SIZE = 1000
+
+# resource name -> (model, exported columns); every export is keyed on id
+EXPORTS = {
+    'orders': (Order, ['id', 'customer_id', 'date_time', 'total', 'status', 'paid', 'paid_by']),
+    'order-details': (OrderDetail, ['id', 'order_id', 'product_id', 'qty', 'price', 'cost']),
+    'products': (Product, ['id', 'title', 'price', 'cost', 'stock', 'description', 'image', 'category_id']),
+    'customers': (Customer, ['id', 'username']),
+}
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@app.get('/admin/export/<resource>')
+@admin_required
+def admin_export(resource):
+    if resource not in EXPORTS:
+        return jsonify({'message': f"Unknown export '{resource}'"}), 404
+    model, columns = EXPORTS[resource]
+
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify({'message': 'format must be csv or ndjson'}), 400
+
+    try:
+        gzip = parse_bool(request.args.get('gzip'))
+    except ValueError:
+        return jsonify({'message': 'gzip must be true or false'}), 400
+    if gzip is None:
+        gzip = 'gzip' in request.accept_encodings
+
+    # Resume an interrupted export from the last id received
+    statement = select(*[getattr(model, c) for c in columns]).order_by(model.id)
+    after = request.args.get('after')
+    if after:
+        try:
+            statement = statement.where(model.id > int(after))
+        except ValueError:
+            return jsonify({'message': 'after must be an integer'}), 400
+
+    # yield_per keeps a server-side cursor open and fetches in batches,
+    # so memory stays flat however many rows are exported
+    rows = (
+        tuple(export_value(v) for v in row)
+        for row in db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    )
+
+    if export_format == 'csv':
+        chunks = csv_lines(columns, rows)
+        mimetype = 'text/csv'
+    else:
+        chunks = ndjson_lines(dict(zip(columns, row)) for row in rows)
+        mimetype = 'application/x-ndjson'
+
+    # gzip is a Content-Encoding, so clients decode it and save the plain file
+    filename = f'{resource}.{export_format}'
+    return stream_response(chunks, mimetype, gzip=gzip, filename=filename)
@@ -0,0 +1,16 @@
+from flask import jsonify
+
+from app import app, query_profiler
+from util.auth import admin_required
+from util.metrics import metrics_response
+
+
+@app.get('/metrics')
+def metrics():
+    return metrics_response(app)
+
+
+@app.get('/admin/db/stats')
+@admin_required
+def db_stats():
+    return jsonify({'endpoints': query_profiler.stats()}), 200
@@ -1,55 +1,149 @@
-import json
+from datetime import date, datetime, time, timedelta
 
 from flask import Flask, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import selectinload
 
 from app import app, db
-from model import Product, Cart, Order
+from model import Product, Cart, Order, OrderDetail
+from util.auth import admin_required
+from util.pagination import decode_cursor, encode_cursor, parse_limit
+from util.params import parse_bool
+from util.streaming import ndjson_response
+
+
+def order_to_dict(order):
+    return {
+        'id': order.id,
+        'customer_id': order.customer_id,
+        'total': order.total,
+        'status': order.status,
+        'paid': order.paid,
+        'paid_by': order.paid_by,
+        'date_time': order.date_time,
+        'details': [{
+            'product_id': d.product_id,
+            'qty': d.qty,
+            'price': d.price,
+            'cost': d.cost
+        } for d in order.details]
+    }
 
 
 @app.get('/admin/order')
-@jwt_required()
+@admin_required
 def admin_get_orders():
-    current_user = json.loads(get_jwt_identity())
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
+    args = request.args
+    query = Order.query.options(selectinload(Order.details))
+    messages = []
+
+    status = args.get('status')
+    if status:
+        query = query.filter(Order.status == status.strip().lower())
+
+    try:
+        paid = parse_bool(args.get('paid'))
+    except ValueError:
+        messages.append('paid must be true or false')
+    else:
+        if paid is not None:
+            query = query.filter(Order.paid == paid)
+
+    customer_id = args.get('customer_id')
+    if customer_id:
+        try:
+            query = query.filter(Order.customer_id == int(customer_id))
+        except ValueError:
+            messages.append('customer_id must be an integer')
+
+    date_from = args.get('date_from')
+    if date_from:
+        try:
+            query = query.filter(Order.date_time >= datetime.fromisoformat(date_from))
+        except ValueError:
+            messages.append('date_from must be an ISO 8601 date')
+
+    date_to = args.get('date_to')
+    if date_to:
+        try:
+            if len(date_to.strip()) == 10:
+                # A bare date includes the whole of that day
+                end = datetime.combine(date.fromisoformat(date_to.strip()), time.min) + timedelta(days=1)
+                query = query.filter(Order.date_time < end)
+            else:
+                query = query.filter(Order.date_time <= datetime.fromisoformat(date_to))
+        except ValueError:
+            messages.append('date_to must be an ISO 8601 date')
+
+    if messages:
+        return jsonify({'message': '; '.join(messages)}), 400
+
+    # Rows without a date_time sort after every dated order on all backends
+    query = query.order_by(Order.date_time.desc().nulls_last(), Order.id.desc())
+
+    if args.get('format') == 'ndjson':
+        # Stream every matching order without holding them all in memory
+        return ndjson_response(order_to_dict(o) for o in query.yield_per(500))
+
+    limit, error = parse_limit(args.get('limit'))
+    if error:
+        return jsonify({'message': error}), 400
+
+    after = args.get('after')
+    if after:
+        cursor = decode_cursor(after, 2)
+        try:
+            after_date = None if cursor[0] is None else datetime.fromisoformat(cursor[0])
+            after_id = int(cursor[1])
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Invalid cursor'}), 400
+        if after_date is None:
+            query = query.filter(Order.date_time.is_(None), Order.id < after_id)
+        else:
+            query = query.filter(or_(
+                Order.date_time < after_date,
+                and_(Order.date_time == after_date, Order.id < after_id),
+                Order.date_time.is_(None)
+            ))
+
+    # Fetch one extra row to know whether another page exists
+    orders = query.limit(limit + 1).all()
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = orders[-1]
+        next_cursor = encode_cursor(last.date_time and last.date_time.isoformat(), last.id)
 
-    orders = Order.query.order_by(Order.date_time.desc()).all()
     if not orders:
         return jsonify({
             'message': 'No orders found',
-            'orders': []
+            'orders': [],
+            'next_cursor': None
         }), 200
 
-    order_list = []
-    for order in orders:
-        order_list.append({
-            'id': order.id,
-            'customer_id': order.customer_id,
-            'total': order.total,
-            'status': order.status,
-            'paid': order.paid,
-            'paid_by': order.paid_by,
-            'date_time': order.date_time,
-            'details': [{
-                'product_id': d.product_id,
-                'qty': d.qty,
-                'price': d.price,
-                'cost': d.cost
-            } for d in order.details]
-        })
+    return jsonify({
+        'orders': [order_to_dict(o) for o in orders],
+        'next_cursor': next_cursor
+    }), 200
 
-    return jsonify({'orders': order_list}), 200
 
+def order_detail_rows(order_id):
+    """Return (OrderDetail, product title) pairs for an order in one query."""
+    return (
+        db.session.query(OrderDetail, Product.title)
+        .outerjoin(Product, OrderDetail.product_id == Product.id)
+        .filter(OrderDetail.order_id == order_id)
+        .order_by(OrderDetail.id)
+        .all()
+    )
 
 
 @app.get('/admin/order/detail/<int:order_id>')
-@jwt_required()
+@admin_required
 def admin_get_order_detail(order_id):
-    current_user = json.loads(get_jwt_identity())
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     order = Order.query.get(order_id)
     if not order:
         return jsonify({'message': 'Order not found'}), 404
@@ -65,11 +159,10 @@ def admin_get_order_detail(order_id):
         'details': []
     }
 
-    for d in order.details:
-        product = Product.query.get(d.product_id)
+    for d, product_title in order_detail_rows(order.id):
         order_data['details'].append({
             'product_id': d.product_id,
-            'product_title': product.title if product else None,
+            'product_title': product_title,
             'qty': d.qty,
             'price': d.price,
             'cost': d.cost,
@@ -79,12 +172,8 @@ def admin_get_order_detail(order_id):
     return jsonify({'order': order_data}), 200
 
 @app.put('/admin/order/update/<int:order_id>')
-@jwt_required()
+@admin_required
 def admin_update_order(order_id):
-    current_user = json.loads(get_jwt_identity())
-    if current_user.get('role') != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     order = Order.query.get(order_id)
     if not order:
         return jsonify({'message': 'Order not found'}), 404
@@ -159,10 +248,9 @@ def track_order(order_id):
         'details': []
     }
 
-    for d in order.details:
-        product = Product.query.get(d.product_id)
+    for d, product_title in order_detail_rows(order.id):
         order_data['details'].append({
-            'product': product.title if product else None,
+            'product': product_title,
             'qty': d.qty,
             'price': d.price,
             'subtotal': d.qty * d.price
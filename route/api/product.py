@@ -1,55 +1,59 @@
-import json
+import mimetypes
 import os
-import uuid
+from urllib.parse import urlencode
 
-from flask_jwt_extended import get_jwt_identity, jwt_required
-from werkzeug.utils import secure_filename
-from app import app,db
-from flask import request, jsonify, send_from_directory, url_for
+from sqlalchemy import bindparam, update
+from app import app, db, catalogue_cache
+from flask import abort, redirect, request, jsonify, send_from_directory, url_for
+from werkzeug.security import safe_join
 from model import Category, Product
+from util.auth import admin_required
+from util.autocomplete import autocomplete_index, ensure_index, mark_stale
+from util.images import VARIANT_WIDTHS, get_image_srcset, get_image_url, image_url_prefix, variant_key
+from util.pagination import decode_cursor, encode_cursor, parse_limit
+from util.params import parse_bool
+from util.product_import import IMPORT_FORMATS, ImportFileError, import_products, read_rows
+from util.search import search_products
+from util.storage import IMMUTABLE_MAX_AGE, UPLOAD_FOLDER, is_content_key, release_upload, save_upload
+from util.thumbnails import generate_variant, schedule_variants
 
-UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
 
+SYNC_MODES = ('absolute', 'delta')
+SYNC_FIELDS = (
+    ('stock', int, 'stock must be an integer'),
+    ('price', float, 'price must be a number'),
+    ('cost', float, 'cost must be a number'),
+)
+SYNC_LOOKUP_CHUNK = 500
+
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-def get_image_url(image):
-    if not image:
-        return None
+def cached_catalogue_response(key, build):
+    status, etag, body = catalogue_cache.get_or_build(key, build)
+    response = app.response_class(body, status=status, mimetype='application/json')
+    if status == 200:
+        response.set_etag(etag)
+        response.make_conditional(request)
+    return response
+
 
-    # If it's a full URL starting with http
-    if image.startswith("http"):
-        # Remove old localhost URLs if embedded
-        image = image.replace("http://127.0.0.1:5000/uploads/", "")
-        image = image.replace("http://localhost:5000/uploads/", "")
+def query_cache_key(name, args):
+    """Cache key for a query string; escaping keeps ``?a=b%26c%3Dd`` apart from ``?a=b&c=d``."""
+    return f'{name}:{image_url_prefix()}?{urlencode(sorted(args.items(multi=True)))}'
 
-        # If already the correct production URL, return as-is
-        if image.startswith("https://ecomapi.kanika.lol/uploads/"):
-            return image
 
-        # Extract filename if /uploads/ is present
-        if "/uploads/" in image:
-            image = image.split("/uploads/")[-1]
+def json_body(payload):
+    return app.json.dumps(payload).encode()
 
-        # Build URL with current host
-        return request.host_url.rstrip('/') + f"/uploads/{image}"
 
-    # If not a full URL, assume it's a filename or relative path; prepend /uploads/
-    # Strip any leading slashes to avoid double slashes
-    image = image.lstrip('/')
-    return request.host_url.rstrip('/') + f"/uploads/{image}"
 # admin panel
 @app.post('/admin/product/create')
-@jwt_required()
+@admin_required
 def create_product():
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     title = request.form.get('title')
     price = request.form.get('price')
     cost = request.form.get('cost')
@@ -115,13 +119,9 @@ def create_product():
 
     image_file = request.files.get('image')
     if image_file and allowed_file(image_file.filename):
-        filename = secure_filename(image_file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-        image_file.save(save_path)
-        image_url = request.host_url.rstrip('/') + f"/uploads/{unique_filename}"
+        image_key = save_upload(image_file)
     else:
-        image_url = None
+        image_key = None
 
 
     product = Product(
@@ -130,12 +130,15 @@ def create_product():
         cost=cost,
         stock=stock,
         description=description,
-        image=image_url,
+        image=image_key,
         category_id=category_id
     )
 
     db.session.add(product)
     db.session.commit()
+    catalogue_cache.invalidate()
+    autocomplete_index.add('product', product.id, product.title)
+    schedule_variants(product.image)
 
     return jsonify({
         'message': 'Product created successfully',
@@ -146,19 +149,15 @@ def create_product():
             'price': product.price,
             'stock': product.stock,
             'description': product.description,
-            'image': product.image,
+            'image': get_image_url(product.image),
             'category': category.name
 
         }
     }), 201
 
 @app.put('/admin/product/update')
-@jwt_required()
+@admin_required
 def update_product():
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     product_id = request.form.get('id')
     if not product_id:
         return jsonify({'message': 'Product ID is required'}), 400
@@ -238,25 +237,23 @@ def update_product():
     if description is not None:
         product.description = description
 
+    old_image = None
+    new_image = None
     image_file = request.files.get('image')
     if image_file and allowed_file(image_file.filename):
+        old_image = product.image
+        new_image = product.image = save_upload(image_file)
 
-        # delete old image
-        if product.image:
-            old_filename = product.image.split('/uploads/')[-1]
-            old_path = os.path.join(UPLOAD_FOLDER, old_filename)
-            if os.path.exists(old_path):
-                os.remove(old_path)
-
-        filename = secure_filename(image_file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-
-        image_file.save(save_path)
+    db.session.commit()
+    catalogue_cache.invalidate()
+    autocomplete_index.add('product', product.id, product.title)
 
-        product.image = request.host_url.rstrip('/') + f"/uploads/{unique_filename}"
+    if new_image:
+        schedule_variants(new_image)
 
-    db.session.commit()
+    # delete old image unless another product still uses it
+    if old_image and old_image != new_image:
+        release_upload(old_image)
 
     return jsonify({
         'message': 'Product updated successfully',
@@ -266,23 +263,59 @@ def update_product():
             'price': product.price,
             'cost': product.cost,
             'stock': product.stock,
-            'image': product.image,
+            'image': get_image_url(product.image),
             'description': product.description,
             'category': product.category.name if product.category else None
         }
     }), 200
+def send_upload(key, immutable):
+    max_age = IMMUTABLE_MAX_AGE if immutable else app.config.get('UPLOADS_MAX_AGE', 3600)
+
+    accel_prefix = app.config.get('UPLOADS_ACCEL_REDIRECT')
+    if accel_prefix:
+        # Hand the transfer to nginx, which also handles ranges and validators
+        path = safe_join(UPLOAD_FOLDER, key)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        response = app.response_class(mimetype=mimetypes.guess_type(key)[0])
+        response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + key
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+    else:
+        # Conditional GET and Range are answered by send_file; with
+        # USE_X_SENDFILE the body is left to the front-end server
+        response = send_from_directory(UPLOAD_FOLDER, key, max_age=max_age)
+
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
+
 @app.route('/uploads/<filename>')
 def uploaded_file(filename):
-    return send_from_directory(UPLOAD_FOLDER, filename)
+    # A content-hash name never changes its bytes, so clients may keep it forever
+    return send_upload(filename, is_content_key(filename))
 
-@app.put('/admin/product/update/<int:id>')
-@jwt_required()
-def update_product_by_id(id):
 
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
+@app.route('/uploads/variants/<int:width>/<filename>')
+def uploaded_variant(width, filename):
+    image = filename.removesuffix('.webp')
+    if width not in VARIANT_WIDTHS or image == filename or safe_join(UPLOAD_FOLDER, image) is None:
+        abort(404)
+
+    # Variants missing from disk are generated on first request
+    if generate_variant(image, width) is None:
+        # Point at the original without letting clients cache it under the
+        # variant URL, so the real variant is served once generation works
+        response = redirect(url_for('uploaded_file', filename=image))
+        response.cache_control.no_store = True
+        return response
 
+    return send_upload(variant_key(image, width), is_content_key(image))
+
+@app.put('/admin/product/update/<int:id>')
+@admin_required
+def update_product_by_id(id):
     product = Product.query.get(id)
     if not product:
         return jsonify({'message': 'Product not found'}), 404
@@ -347,22 +380,23 @@ def update_product_by_id(id):
     if description is not None:
         product.description = description
 
+    old_image = None
+    new_image = None
     image_file = request.files.get('image')
     if image_file and allowed_file(image_file.filename):
-        # Delete old image
-        if product.image:
-            old_filename = product.image.split('/uploads/')[-1]
-            old_path = os.path.join(UPLOAD_FOLDER, old_filename)
-            if os.path.exists(old_path):
-                os.remove(old_path)
-
-        filename = secure_filename(image_file.filename)
-        unique_filename = f"{uuid.uuid4().hex}_{filename}"
-        save_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-        image_file.save(save_path)
-        product.image = request.host_url.rstrip('/') + f"/uploads/{unique_filename}"
+        old_image = product.image
+        new_image = product.image = save_upload(image_file)
 
     db.session.commit()
+    catalogue_cache.invalidate()
+    autocomplete_index.add('product', product.id, product.title)
+
+    if new_image:
+        schedule_variants(new_image)
+
+    # Delete old image unless another product still uses it
+    if old_image and old_image != new_image:
+        release_upload(old_image)
 
     return jsonify({
         'message': 'Product updated successfully',
@@ -373,42 +407,33 @@ def update_product_by_id(id):
             'cost': product.cost,
             'stock': product.stock,
             'description': product.description,
-            'image': product.image,
+            'image': get_image_url(product.image),
             'category': product.category.name if product.category else None
         }
     }), 200
 
 @app.delete('/admin/product/delete/<int:id>')
-@jwt_required()
+@admin_required
 def delete_product_by_id(id):
-
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     product = Product.query.get(id)
     if not product:
         return jsonify({'message': 'Product not found'}), 404
 
-    if product.image:
-        old_filename = product.image.split('/uploads/')[-1]
-        old_path = os.path.join(UPLOAD_FOLDER, old_filename)
-        if os.path.exists(old_path):
-            os.remove(old_path)
+    image = product.image
 
     db.session.delete(product)
     db.session.commit()
+    catalogue_cache.invalidate()
+    autocomplete_index.remove('product', id)
+
+    if image:
+        release_upload(image)
 
     return jsonify({'message': 'Product deleted successfully'}), 200
 
 @app.delete('/admin/product/delete')
-@jwt_required()
+@admin_required
 def delete_product():
-
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
-
     product_id = request.form.get('id') or request.json.get('id')
     if not product_id:
         return jsonify({'message': 'Product ID is required'}), 400
@@ -422,25 +447,214 @@ def delete_product():
     if not product:
         return jsonify({'message': 'Product not found'}), 404
 
-    if product.image:
-        old_filename = product.image.split('/uploads/')[-1]
-        old_path = os.path.join(UPLOAD_FOLDER, old_filename)
-        if os.path.exists(old_path):
-            os.remove(old_path)
+    image = product.image
 
     db.session.delete(product)
     db.session.commit()
+    catalogue_cache.invalidate()
+    autocomplete_index.remove('product', product_id)
+
+    if image:
+        release_upload(image)
 
     return jsonify({'message': 'Product deleted successfully'}), 200
 
 
 
+@app.post('/admin/product/import')
+@admin_required
+def bulk_import_products():
+    import_format = request.args.get('format')
+    upload = request.files.get('file')
+    if upload:
+        stream = upload.stream
+        if not import_format and '.' in upload.filename:
+            import_format = upload.filename.rsplit('.', 1)[1].lower()
+    else:
+        stream = request.stream
+        if not import_format:
+            import_format = {
+                'text/csv': 'csv',
+                'application/x-ndjson': 'ndjson'
+            }.get(request.mimetype)
+
+    if import_format not in IMPORT_FORMATS:
+        return jsonify({'message': 'Upload a .csv or .ndjson file or pass format=csv|ndjson'}), 400
+
+    try:
+        dry_run = parse_bool(request.args.get('dry_run')) or False
+    except ValueError:
+        return jsonify({'message': 'dry_run must be true or false'}), 400
+
+    try:
+        inserted, errors = import_products(read_rows(stream, import_format), dry_run=dry_run)
+    except ImportFileError as e:
+        # Batches inserted before the unreadable part are not committed
+        db.session.rollback()
+        return jsonify({'message': str(e)}), 400
+
+    if inserted and not dry_run:
+        db.session.commit()
+        catalogue_cache.invalidate()
+        mark_stale()
+
+    return jsonify({
+        'message': f"{inserted} products {'valid' if dry_run else 'imported'}, {len(errors)} rejected",
+        'inserted': inserted,
+        'failed': len(errors),
+        'errors': errors
+    }), 200
+
+
+def apply_sync_batches(batches, row_by_row=False):
+    """Run inventory-sync UPDATE batches; return ``(updated, rejected)``.
+
+    Delta stock changes only apply while the result stays non-negative.
+    ``rejected`` lists ``(index, product_id)`` of items that failed that
+    condition, or is None when a batched UPDATE came up short and the caller
+    has to roll back and replay with ``row_by_row``.
+    """
+    table = Product.__table__
+    row_by_row = row_by_row or not db.engine.dialect.supports_sane_multi_rowcount
+    updated = 0
+    rejected = []
+    for (mode, fields), params, indexes in batches:
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam('product_id'))
+            .values({
+                field: (table.c[field] + bindparam(f'new_{field}')) if mode == 'delta'
+                else bindparam(f'new_{field}')
+                for field in fields
+            })
+        )
+        if mode != 'delta' or 'stock' not in fields:
+            db.session.execute(statement, params)
+            updated += len(params)
+            continue
+
+        statement = statement.where(table.c.stock + bindparam('new_stock') >= 0)
+        if not row_by_row:
+            if db.session.execute(statement, params).rowcount != len(params):
+                return updated, None
+            updated += len(params)
+            continue
+
+        for row, index in zip(params, indexes):
+            if db.session.execute(statement, row).rowcount:
+                updated += 1
+            else:
+                rejected.append((index, row['product_id']))
+    return updated, rejected
+
+
+@app.post('/admin/product/inventory-sync')
+@admin_required
+def inventory_sync():
+    data = request.get_json(silent=True) or {}
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({'message': 'items must be a non-empty list'}), 400
+
+    default_mode = data.get('mode', 'absolute')
+    if default_mode not in SYNC_MODES:
+        return jsonify({'message': 'mode must be absolute or delta'}), 400
+
+    errors = []
+    updates = []
+    for index, item in enumerate(items):
+        item_errors = []
+        if not isinstance(item, dict):
+            errors.append({'index': index, 'errors': ['item must be an object']})
+            continue
+
+        mode = item.get('mode', default_mode)
+        if mode not in SYNC_MODES:
+            item_errors.append('mode must be absolute or delta')
+
+        try:
+            product_id = int(item.get('id'))
+        except (ValueError, TypeError):
+            item_errors.append('id must be an integer')
+
+        values = {}
+        for field, cast, message in SYNC_FIELDS:
+            if item.get(field) is None:
+                continue
+            try:
+                values[field] = cast(item[field])
+            except (ValueError, TypeError):
+                item_errors.append(message)
+
+        if not values and not item_errors:
+            item_errors.append('at least one of stock, price, cost is required')
+
+        if item_errors:
+            errors.append({'index': index, 'id': item.get('id'), 'errors': item_errors})
+        else:
+            updates.append((index, product_id, mode, values))
+
+    # One IN query per chunk gives current stock for every referenced product
+    ids = list({product_id for _, product_id, _, _ in updates})
+    stock = {}
+    for start in range(0, len(ids), SYNC_LOOKUP_CHUNK):
+        stock.update(
+            db.session.query(Product.id, Product.stock)
+            .filter(Product.id.in_(ids[start:start + SYNC_LOOKUP_CHUNK]))
+        )
+
+    missing = sorted(set(ids) - stock.keys())
+
+    # Consecutive rows sharing a mode and field set become one executemany
+    # UPDATE; a new batch starts whenever the key changes, so the updates run
+    # in request order and match the stock values checked below.
+    batches = []
+    for index, product_id, mode, values in updates:
+        if product_id not in stock:
+            continue
+
+        if 'stock' in values:
+            new_stock = values['stock'] + (stock[product_id] if mode == 'delta' else 0)
+            if new_stock < 0:
+                errors.append({'index': index, 'id': product_id, 'errors': ['stock cannot be negative']})
+                continue
+            stock[product_id] = new_stock
+
+        key = (mode, tuple(sorted(values)))
+        params = {f'new_{field}': value for field, value in values.items()}
+        params['product_id'] = product_id
+        if batches and batches[-1][0] == key:
+            batches[-1][1].append(params)
+            batches[-1][2].append(index)
+        else:
+            batches.append((key, [params], [index]))
+
+    # The checks above used stock read earlier in this request; a checkout
+    # committing since then is caught by the conditional UPDATE. When a
+    # batch comes up short, replay row by row to find the rejected items.
+    updated, rejected = apply_sync_batches(batches)
+    if rejected is None:
+        db.session.rollback()
+        updated, rejected = apply_sync_batches(batches, row_by_row=True)
+    for index, product_id in rejected:
+        errors.append({'index': index, 'id': product_id, 'errors': ['stock cannot be negative']})
+    errors.sort(key=lambda error: error['index'])
+
+    if updated:
+        db.session.commit()
+        catalogue_cache.invalidate()
+
+    return jsonify({
+        'message': f'{updated} updates applied',
+        'updated': updated,
+        'missing': missing,
+        'errors': errors
+    }), 200
+
+
 @app.get('/admin/product/list')
-@jwt_required()
+@admin_required
 def admin_get_products():
-    current_user = json.loads(get_jwt_identity())
-    if current_user['role'] != 'admin':
-        return jsonify({'message': 'Admin access required'}), 403
     products = Product.query.all()
 
     product_list = []
@@ -455,7 +669,8 @@ def admin_get_products():
     'description': p.description,
     'cost': p.cost,
     'category': p.category.name,
-    'image': image_url
+    'image': image_url,
+    'srcset': get_image_srcset(p.image)
 })
 
 
@@ -467,68 +682,214 @@ def admin_get_products():
 # Front Panel
 @app.get('/product/list')
 def get_products():
-    products = Product.query.all()
+    args = request.args
+
+    limit, error = parse_limit(args.get('limit'))
+    if error:
+        return jsonify({'message': error}), 400
+
+    after = args.get('after')
+    after_id = None
+    if after:
+        cursor = decode_cursor(after, 1)
+        if cursor is None or not isinstance(cursor[0], int):
+            return jsonify({'message': 'Invalid cursor'}), 400
+        after_id = cursor[0]
+
+    query = (
+        db.session.query(Product, Category.name)
+        .join(Category, Product.category_id == Category.id)
+    )
 
-    product_list = []
-    for p in products:
-        image_url = get_image_url(p.image)
+    invalid_fields = []
 
+    category_id = args.get('category_id')
+    if category_id:
+        try:
+            query = query.filter(Product.category_id == int(category_id))
+        except ValueError:
+            invalid_fields.append('category_id must be an integer')
+
+    category_name = args.get('category')
+    if category_name:
+        query = query.filter(Category.name == category_name.strip())
+
+    for param, column_filter in (
+        ('min_price', lambda v: Product.price >= v),
+        ('max_price', lambda v: Product.price <= v),
+    ):
+        value = args.get(param)
+        if value:
+            try:
+                query = query.filter(column_filter(float(value)))
+            except ValueError:
+                invalid_fields.append(f'{param} must be a number')
 
-        product_list.append({
-            'id': p.id,
-            'title': p.title,
-            'price': p.price,
-            'stock': p.stock,
-            'description': p.description,
-            'cost': p.cost,
-            'category': p.category.name,
-            'image': image_url
+    try:
+        in_stock = parse_bool(args.get('in_stock'))
+    except ValueError:
+        invalid_fields.append('in_stock must be true or false')
+    else:
+        if in_stock is True:
+            query = query.filter(Product.stock > 0)
+        elif in_stock is False:
+            query = query.filter(Product.stock <= 0)
 
+    if invalid_fields:
+        return jsonify({'message': '; '.join(invalid_fields)}), 400
+
+    if after_id is not None:
+        query = query.filter(Product.id > after_id)
+
+    def build():
+        # Fetch one extra row to know whether another page exists
+        rows = query.order_by(Product.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        product_list = []
+        for p, category in rows:
+            product_list.append({
+                'id': p.id,
+                'title': p.title,
+                'price': p.price,
+                'stock': p.stock,
+                'description': p.description,
+                'cost': p.cost,
+                'category': category,
+                'image': get_image_url(p.image),
+                'srcset': get_image_srcset(p.image)
+            })
+
+        return 200, json_body({
+            'products': product_list,
+            'next_cursor': encode_cursor(rows[-1][0].id) if has_more else None
         })
 
-    return jsonify(product_list)
+    return cached_catalogue_response(query_cache_key('products', args), build)
 
-@app.get('/product/list/category')
-def get_products_by_category_name():
-    data = request.get_json()
 
-    category_name = data.get('category_name') if data else None
-    if not category_name:
-        return {"message": "category_name is required"}, 400
+@app.get('/product/search')
+def search():
+    args = request.args
 
-    category = Category.query.filter_by(name=category_name).first()
-    if not category:
-        return {
-            "message": "Category not found",
-        }, 404
-
-    products = (
-        Product.query
-        .join(Category)
-        .filter(Category.name == category_name)
-        .all()
-    )
+    q = (args.get('q') or '').strip()
+    if not q:
+        return jsonify({'message': 'q is required'}), 400
 
-    if not products:
-        return {
-            "message": "No products found in this category",
-        }, 200
+    limit, error = parse_limit(args.get('limit'), default=20)
+    if error:
+        return jsonify({'message': error}), 400
 
-    product_list = []
-    for p in products:
-        image_url = get_image_url(p.image)
+    # Results are ranked, so the cursor carries an offset rather than a key
+    offset = 0
+    after = args.get('after')
+    if after:
+        cursor = decode_cursor(after, 1)
+        if cursor is None or not isinstance(cursor[0], int) or cursor[0] < 0:
+            return jsonify({'message': 'Invalid cursor'}), 400
+        offset = cursor[0]
 
-        product_list.append({
-            'id': p.id,
-            'title': p.title,
-            'price': p.price,
-            'stock': p.stock,
-            'description': p.description,
-            'category': p.category.name,
-            'image': image_url,
-            'cost': p.cost
+    category_id = args.get('category_id')
+    if category_id:
+        try:
+            category_id = int(category_id)
+        except ValueError:
+            return jsonify({'message': 'category_id must be an integer'}), 400
+    else:
+        category_id = None
+
+    def build():
+        rows, total, facets = search_products(q, category_id, limit, offset)
+
+        product_list = []
+        for p, category in rows:
+            product_list.append({
+                'id': p.id,
+                'title': p.title,
+                'price': p.price,
+                'stock': p.stock,
+                'description': p.description,
+                'cost': p.cost,
+                'category': category,
+                'image': get_image_url(p.image),
+                'srcset': get_image_srcset(p.image)
+            })
+
+        return 200, json_body({
+            'products': product_list,
+            'total': total,
+            'facets': facets,
+            'next_cursor': encode_cursor(offset + limit) if offset + limit < total else None
         })
 
-    return jsonify(product_list), 200
+    return cached_catalogue_response(query_cache_key('search', args), build)
+
+
+@app.get('/product/autocomplete')
+def autocomplete():
+    q = request.args.get('q') or ''
+
+    limit, error = parse_limit(request.args.get('limit'), default=10, maximum=25)
+    if error:
+        return jsonify({'message': error}), 400
+
+    ensure_index()
+    return jsonify({'suggestions': autocomplete_index.suggest(q, limit)}), 200
 
 
+@app.get('/admin/autocomplete/stats')
+@admin_required
+def autocomplete_stats():
+    ensure_index()
+    return jsonify(autocomplete_index.stats()), 200
+
+
+@app.get('/product/list/category')
+def get_products_by_category_name():
+    data = request.get_json()
+
+    category_name = data.get('category_name') if data else None
+    if not category_name:
+        return {"message": "category_name is required"}, 400
+
+    def build():
+        category = Category.query.filter_by(name=category_name).first()
+        if not category:
+            return 404, json_body({
+                "message": "Category not found",
+            })
+
+        products = (
+            Product.query
+            .join(Category)
+            .filter(Category.name == category_name)
+            .all()
+        )
+
+        if not products:
+            return 200, json_body({
+                "message": "No products found in this category",
+            })
+
+        product_list = []
+        for p in products:
+            image_url = get_image_url(p.image)
+
+            product_list.append({
+                'id': p.id,
+                'title': p.title,
+                'price': p.price,
+                'stock': p.stock,
+                'description': p.description,
+                'category': category.name,
+                'image': image_url,
+                'srcset': get_image_srcset(p.image),
+                'cost': p.cost
+            })
+
+        return 200, json_body(product_list)
+
+    return cached_catalogue_response(
+        'category:' + image_url_prefix() + '\n' + category_name, build
+    )
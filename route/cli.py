@@ -0,0 +1,79 @@
+import os
+
+import click
+
+from app import app, db, catalogue_cache
+from model import Product
+from util.images import storage_key
+from util.product_import import IMPORT_BATCH_SIZE, IMPORT_FORMATS, ImportFileError, import_products, read_rows
+from util.storage import RELEASE_GRACE, UPLOAD_FOLDER, is_stored_upload, remove_blob, sweep_uploads, write_blob
+
+
+@app.cli.command('dedupe-uploads')
+def dedupe_uploads():
+    """Re-key product images by content hash and remove duplicate files."""
+    rekeyed = {}
+
+    for product in Product.query.filter(Product.image.isnot(None)).all():
+        key = storage_key(product.image)
+        if key not in rekeyed:
+            if not is_stored_upload(key):
+                click.echo(f"Missing file for product {product.id}: {key}")
+                continue
+            with open(os.path.join(UPLOAD_FOLDER, key), 'rb') as f:
+                rekeyed[key] = write_blob(f, key.rsplit('.', 1)[-1].lower())
+
+        product.image = rekeyed[key]
+
+    db.session.commit()
+    # Cached list and search pages still point at the old keys
+    catalogue_cache.invalidate()
+
+    removed = 0
+    for old_key, new_key in rekeyed.items():
+        if old_key != new_key:
+            # Drops the old key's variants along with the file
+            remove_blob(old_key)
+            removed += 1
+
+    click.echo(f"{len(rekeyed)} images re-keyed into {len(set(rekeyed.values()))} blobs, "
+               f"{removed} files removed")
+
+
+@app.cli.command('sweep-uploads')
+@click.option('--grace', default=RELEASE_GRACE, show_default=True,
+              help='Only remove files older than this many seconds.')
+def sweep_uploads_command(grace):
+    """Remove unreferenced image blobs and leftover temp files."""
+    blobs, parts = sweep_uploads(grace)
+    click.echo(f"{blobs} unreferenced blobs and {parts} temp files removed")
+
+
+@app.cli.command('import-products')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'import_format', type=click.Choice(IMPORT_FORMATS),
+              help='Defaults to the file extension.')
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True)
+@click.option('--dry-run', is_flag=True, help='Validate without inserting.')
+def import_products_command(path, import_format, batch_size, dry_run):
+    """Bulk-load products from a CSV or NDJSON file."""
+    import_format = import_format or path.rsplit('.', 1)[-1].lower()
+    if import_format not in IMPORT_FORMATS:
+        raise click.UsageError('Pass --format for files without a .csv or .ndjson extension')
+
+    with open(path, 'rb') as f:
+        try:
+            inserted, errors = import_products(
+                read_rows(f, import_format), batch_size=batch_size, dry_run=dry_run
+            )
+        except ImportFileError as e:
+            db.session.rollback()
+            raise click.ClickException(str(e))
+
+    if inserted and not dry_run:
+        db.session.commit()
+        catalogue_cache.invalidate()
+
+    for error in errors:
+        click.echo(f"row {error['row']}: {'; '.join(error['errors'])}", err=True)
+    click.echo(f"{inserted} products {'valid' if dry_run else 'imported'}, {len(errors)} rejected")
@@ -0,0 +1,26 @@
+import sys
+
+from util.autocomplete import PrefixIndex
+
+
+def walked_size(index):
+    size = sys.getsizeof(index._entries) + sys.getsizeof(index._labels)
+    for entry in index._entries:
+        size += sys.getsizeof(entry[0]) + sys.getsizeof(entry)
+    return size + sum(sys.getsizeof(label) for label in index._labels.values())
+
+
+def test_stats_size_tracks_changes():
+    index = PrefixIndex()
+    index.build([('product', 1, 'Coca-Cola Zero'), ('category', 1, 'Drinks')])
+    assert index.stats()['approx_bytes'] == walked_size(index)
+
+    index.add('product', 2, 'Orange Juice')
+    index.add('product', 1, 'Coca-Cola Light')
+    index.remove('category', 1)
+
+    stats = index.stats()
+    assert stats['items'] == 2
+    assert stats['entries'] == 5
+    assert stats['approx_bytes'] == walked_size(index)
+    assert [s['label'] for s in index.suggest('co')] == ['Coca-Cola Light']
@@ -0,0 +1,45 @@
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from model import Category, Customer, Product
+
+
+@pytest.fixture
+def shopper(app):
+    category = Category(name='Tea')
+    customer = Customer(username='shopper', password='x')
+    db.session.add_all([category, customer])
+    db.session.flush()
+    product = Product(title='Green', price=3, cost=1, stock=5, category_id=category.id)
+    db.session.add(product)
+    db.session.commit()
+
+    token = create_access_token(identity=str(customer.id), additional_claims={'role': 'customer'})
+    return {'headers': {'Authorization': f'Bearer {token}'}, 'product_id': product.id}
+
+
+def test_add_to_cart(client, shopper):
+    for _ in range(2):
+        response = client.post('/api/cart', headers=shopper['headers'], json={'product_id': shopper['product_id']})
+
+    assert response.status_code == 200
+    assert response.get_json()['cart_item']['qty'] == 2
+
+
+def test_conflicting_row_removed_before_retry(client, shopper, monkeypatch):
+    # A concurrent add wins the unique index, then a checkout clears the cart
+    original_commit = db.session.commit
+    calls = []
+
+    def commit():
+        if not calls:
+            calls.append(True)
+            raise IntegrityError('INSERT INTO cart', {}, Exception('UNIQUE constraint failed'))
+        original_commit()
+    monkeypatch.setattr(db.session, 'commit', commit)
+
+    response = client.post('/api/cart', headers=shopper['headers'], json={'product_id': shopper['product_id']})
+
+    assert response.status_code == 409
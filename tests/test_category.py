@@ -0,0 +1,18 @@
+def test_create_category_invalidates_cached_not_found(client, admin_headers):
+    response = client.get('/product/list/category', json={'category_name': 'Snacks'})
+    assert response.status_code == 404
+
+    response = client.post('/admin/category/create', json={'name': 'Snacks'}, headers=admin_headers)
+    assert response.status_code == 201
+
+    response = client.get('/product/list/category', json={'category_name': 'Snacks'})
+    assert response.status_code == 200
+    assert response.get_json() == {'message': 'No products found in this category'}
+
+
+def test_create_duplicate_category(client, admin_headers):
+    client.post('/admin/category/create', json={'name': 'Snacks'}, headers=admin_headers)
+    response = client.post('/admin/category/create', json={'name': 'Snacks'}, headers=admin_headers)
+
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Category already exists'
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import delete, update
+from flask_jwt_extended import create_access_token
+
+from app import db
+from model import Cart, Category, Customer, Product
+
+
+@pytest.fixture
+def cart(app):
+    category = Category(name='Tea')
+    customer = Customer(username='buyer', password='x')
+    db.session.add_all([category, customer])
+    db.session.flush()
+    products = [
+        Product(title='Green', price=3, cost=1, stock=5, category_id=category.id),
+        Product(title='Black', price=2, cost=1, stock=5, category_id=category.id),
+    ]
+    db.session.add_all(products)
+    db.session.flush()
+    db.session.add_all([Cart(customer_id=customer.id, product_id=p.id, qty=2) for p in products])
+    db.session.commit()
+
+    token = create_access_token(identity=str(customer.id), additional_claims={'role': 'customer'})
+    return {'headers': {'Authorization': f'Bearer {token}'}, 'product_ids': [p.id for p in products]}
+
+
+def test_checkout(client, cart):
+    response = client.post('/api/checkout', headers=cart['headers'])
+
+    assert response.status_code == 201
+    assert response.get_json()['order']['total'] == 10
+    assert [p.stock for p in Product.query.order_by(Product.id)] == [3, 3]
+
+
+def test_insufficient_stock(client, cart):
+    Product.query.get(cart['product_ids'][1]).stock = 1
+    db.session.commit()
+
+    response = client.post('/api/checkout', headers=cart['headers'])
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['message'] == 'Insufficient stock for Black'
+    assert body['items'] == [{'product_id': cart['product_ids'][1], 'product': 'Black',
+                              'requested': 2, 'available': 1}]
+
+
+def test_stock_taken_during_checkout(client, cart, monkeypatch):
+    # Simulate a concurrent checkout emptying a product and deleting the other
+    # between the stock check and the conditional UPDATE
+    green, black = cart['product_ids']
+    original_execute = db.session.execute
+
+    def execute(statement, *args, **kwargs):
+        if getattr(statement, 'is_dml', False) and statement.table.name == 'product':
+            db.session.rollback()
+            with db.engine.begin() as other:
+                other.execute(update(Product).where(Product.id == green).values(stock=0))
+                other.execute(delete(Cart).where(Cart.product_id == black))
+                other.execute(delete(Product).where(Product.id == black))
+        return original_execute(statement, *args, **kwargs)
+    monkeypatch.setattr(db.session, 'execute', execute)
+
+    response = client.post('/api/checkout', headers=cart['headers'])
+
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['message'] == 'Insufficient stock for Green, Black'
+    assert [i['available'] for i in body['items']] == [0, 0]
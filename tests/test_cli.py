@@ -0,0 +1,39 @@
+import hashlib
+
+import pytest
+
+from app import db, catalogue_cache
+from model import Category, Product
+from route import cli
+from util import storage
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setattr(cli, 'UPLOAD_FOLDER', str(tmp_path))
+    return tmp_path
+
+
+def test_dedupe_uploads_rekeys_and_invalidates(app, upload_folder):
+    (upload_folder / 'legacy.png').write_bytes(b'image')
+    variant = upload_folder / 'variants' / '128' / 'legacy.png.webp'
+    variant.parent.mkdir(parents=True)
+    variant.write_bytes(b'webp')
+
+    category = Category(name='Drinks')
+    db.session.add(category)
+    db.session.flush()
+    db.session.add(Product(title='Cola', price=1, cost=1, stock=1, image='legacy.png', category_id=category.id))
+    db.session.commit()
+    version = catalogue_cache.version()
+
+    result = app.test_cli_runner().invoke(args=['dedupe-uploads'])
+
+    assert result.exit_code == 0, result.output
+    key = hashlib.sha256(b'image').hexdigest() + '.png'
+    assert Product.query.one().image == key
+    assert (upload_folder / key).exists()
+    assert not (upload_folder / 'legacy.png').exists()
+    assert not variant.exists()
+    assert catalogue_cache.version() != version
@@ -0,0 +1,18 @@
+import gzip
+
+
+def test_gzip_export_is_a_content_encoding(client, admin_headers):
+    response = client.get('/admin/export/products?gzip=true', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Content-Disposition'] == 'attachment; filename="products.csv"'
+    assert gzip.decompress(response.data).decode().startswith('id,title,')
+
+
+def test_plain_export_has_no_content_encoding(client, admin_headers):
+    response = client.get('/admin/export/products?gzip=false', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.data.decode().startswith('id,title,')
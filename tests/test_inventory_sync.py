@@ -0,0 +1,73 @@
+from sqlalchemy import update
+
+from app import db
+from model import Category, Product
+
+
+def make_product(stock):
+    category = Category(name='Drinks')
+    db.session.add(category)
+    db.session.flush()
+    product = Product(title='Cola', price=1.0, cost=0.5, stock=stock, category_id=category.id)
+    db.session.add(product)
+    db.session.commit()
+    return product.id
+
+
+def test_mixed_delta_and_absolute_apply_in_request_order(client, admin_headers):
+    product_id = make_product(stock=5)
+
+    response = client.post('/admin/product/inventory-sync', headers=admin_headers, json={'items': [
+        {'id': product_id, 'mode': 'delta', 'stock': 3},
+        {'id': product_id, 'mode': 'absolute', 'stock': 2},
+        {'id': product_id, 'mode': 'delta', 'stock': 8},
+    ]})
+
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == 3
+    db.session.expire_all()
+    assert db.session.get(Product, product_id).stock == 10
+
+
+def test_negative_stock_guard_uses_value_after_earlier_items(client, admin_headers):
+    product_id = make_product(stock=5)
+
+    response = client.post('/admin/product/inventory-sync', headers=admin_headers, json={'items': [
+        {'id': product_id, 'mode': 'absolute', 'stock': 2},
+        {'id': product_id, 'mode': 'delta', 'stock': -3},
+        {'id': product_id, 'mode': 'delta', 'stock': -2},
+    ]})
+
+    body = response.get_json()
+    assert body['updated'] == 2
+    assert [error['index'] for error in body['errors']] == [1]
+    db.session.expire_all()
+    assert db.session.get(Product, product_id).stock == 0
+
+
+def test_delta_rejected_when_stock_sold_after_the_check(client, admin_headers, monkeypatch):
+    product_id = make_product(stock=5)
+    original_execute = db.session.execute
+    sold = []
+
+    def execute(statement, *args, **kwargs):
+        # A checkout commits between the stock read and the first UPDATE
+        if getattr(statement, 'is_dml', False) and not sold:
+            sold.append(True)
+            db.session.rollback()
+            with db.engine.begin() as other:
+                other.execute(update(Product).where(Product.id == product_id).values(stock=1))
+        return original_execute(statement, *args, **kwargs)
+    monkeypatch.setattr(db.session, 'execute', execute)
+
+    response = client.post('/admin/product/inventory-sync', headers=admin_headers, json={'items': [
+        {'id': product_id, 'mode': 'delta', 'stock': -2},
+        {'id': product_id, 'mode': 'delta', 'stock': 3},
+        {'id': product_id, 'mode': 'delta', 'stock': -4},
+    ]})
+
+    body = response.get_json()
+    assert body['updated'] == 2
+    assert body['errors'] == [{'index': 0, 'id': product_id, 'errors': ['stock cannot be negative']}]
+    db.session.expire_all()
+    assert db.session.get(Product, product_id).stock == 0
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from app import db
+from model import Customer, Order
+
+
+def test_admin_orders_pages_through_undated_orders(app, client, admin_headers):
+    customer = Customer(username='pager', password='x')
+    db.session.add(customer)
+    db.session.flush()
+
+    start = datetime(2026, 1, 1)
+    dated = [Order(customer_id=customer.id, total=1, date_time=start + timedelta(days=i)) for i in range(3)]
+    db.session.add_all(dated)
+    db.session.flush()
+    undated = [Order(customer_id=customer.id, total=1) for _ in range(3)]
+    db.session.add_all(undated)
+    db.session.flush()
+    for order in undated:
+        order.date_time = None
+    db.session.commit()
+
+    seen = []
+    after = None
+    while True:
+        url = '/admin/order?limit=2' + (f'&after={after}' if after else '')
+        response = client.get(url, headers=admin_headers)
+        assert response.status_code == 200
+        body = response.get_json()
+        seen.extend(o['id'] for o in body['orders'])
+        after = body['next_cursor']
+        if not after:
+            break
+
+    expected = [o.id for o in reversed(dated)] + sorted((o.id for o in undated), reverse=True)
+    assert seen == expected
+
+
+def test_date_to_includes_the_whole_day(app, client, admin_headers):
+    customer = Customer(username='dated', password='x')
+    db.session.add(customer)
+    db.session.flush()
+    db.session.add_all([
+        Order(customer_id=customer.id, total=1, date_time=datetime(2026, 1, 31, 15, 30)),
+        Order(customer_id=customer.id, total=2, date_time=datetime(2026, 2, 1, 0, 0)),
+    ])
+    db.session.commit()
+
+    response = client.get('/admin/order?date_to=2026-01-31', headers=admin_headers)
+    assert [o['total'] for o in response.get_json()['orders']] == [1]
+
+    response = client.get('/admin/order?date_to=2026-01-31T12:00:00', headers=admin_headers)
+    assert response.get_json()['orders'] == []
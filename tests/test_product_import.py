@@ -0,0 +1,64 @@
+import io
+import json
+
+from app import db
+from model import Category, Product
+from util import storage
+
+
+def post_csv(client, headers, content):
+    return client.post(
+        '/admin/product/import', headers=headers,
+        data={'file': (io.BytesIO(content), 'products.csv')},
+        content_type='multipart/form-data'
+    )
+
+
+def test_import_valid_csv(client, admin_headers):
+    db.session.add(Category(name='Drinks'))
+    db.session.commit()
+
+    response = post_csv(client, admin_headers, b'title,price,cost,stock,category\nCola,1.5,0.5,10,Drinks\n')
+
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 1
+    assert Product.query.count() == 1
+
+
+def test_import_non_utf8_file_is_rejected(client, admin_headers):
+    response = post_csv(client, admin_headers, 'title,price\nCaf\xe9,1\n'.encode('latin-1'))
+
+    assert response.status_code == 400
+    assert 'UTF-8' in response.get_json()['message']
+
+
+def test_import_malformed_csv_is_rejected(client, admin_headers):
+    # One field over the csv module's 128 KiB field limit
+    response = post_csv(client, admin_headers, b'title,price\n' + b'x' * 200_000 + b',1\n')
+
+    assert response.status_code == 400
+    assert 'Malformed CSV' in response.get_json()['message']
+
+
+def test_import_rejects_image_outside_uploads(client, admin_headers, tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'UPLOAD_FOLDER', str(tmp_path))
+    (tmp_path / 'cola.png').write_bytes(b'png')
+    db.session.add(Category(name='Drinks'))
+    db.session.commit()
+
+    rows = [
+        {'title': 'Cola', 'price': 1, 'cost': 1, 'stock': 1, 'category': 'Drinks', 'image': 'cola.png'},
+        {'title': 'Escape', 'price': 1, 'cost': 1, 'stock': 1, 'category': 'Drinks',
+         'image': '../../victim_file.txt'},
+        {'title': 'Missing', 'price': 1, 'cost': 1, 'stock': 1, 'category': 'Drinks', 'image': 'nope.png'},
+    ]
+    response = client.post(
+        '/admin/product/import?format=ndjson', headers=admin_headers,
+        data='\n'.join(json.dumps(row) for row in rows), content_type='application/x-ndjson'
+    )
+
+    body = response.get_json()
+    assert body['inserted'] == 1
+    assert [e['row'] for e in body['errors']] == [2, 3]
+    assert body['errors'][0]['errors'] == ['image must be the file name of an existing upload']
+    assert Product.query.one().image == 'cola.png'
@@ -0,0 +1,38 @@
+from app import db, catalogue_cache
+from model import Category, Product
+
+
+def test_product_list_shape_and_empty_in_stock(app, client):
+    category = Category(name='Fruit')
+    db.session.add(category)
+    db.session.flush()
+    db.session.add_all([
+        Product(title='Apple', price=1, cost=1, stock=3, category_id=category.id),
+        Product(title='Pear', price=1, cost=1, stock=0, category_id=category.id),
+    ])
+    db.session.commit()
+    catalogue_cache.invalidate()
+
+    response = client.get('/product/list?in_stock=')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert [p['title'] for p in body['products']] == ['Apple', 'Pear']
+    assert body['next_cursor'] is None
+
+    response = client.get('/product/list?in_stock=true')
+    assert [p['title'] for p in response.get_json()['products']] == ['Apple']
+
+
+def test_escaped_query_does_not_share_a_cache_entry(app, client):
+    category = Category(name='Drinks')
+    db.session.add(category)
+    db.session.flush()
+    db.session.add(Product(title='Cola', price=1, cost=1, stock=3, category_id=category.id))
+    db.session.commit()
+    catalogue_cache.invalidate()
+
+    response = client.get('/product/list?category=Drinks%26limit%3D20')
+    assert response.get_json()['products'] == []
+
+    response = client.get('/product/list?category=Drinks&limit=20')
+    assert [p['title'] for p in response.get_json()['products']] == ['Cola']
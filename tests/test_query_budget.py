@@ -0,0 +1,73 @@
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app import db, catalogue_cache
+from model import Cart, Category, Customer, Order, OrderDetail, Product
+from util.profiling import query_budget
+
+ITEMS = 5
+
+
+@pytest.fixture
+def shop(app):
+    category = Category(name='Drinks')
+    customer = Customer(username='budget', password='x')
+    db.session.add_all([category, customer])
+    db.session.flush()
+
+    products = [
+        Product(title=f'Product {i}', price=2, cost=1, stock=10, category_id=category.id)
+        for i in range(ITEMS)
+    ]
+    db.session.add_all(products)
+    db.session.flush()
+
+    order = Order(customer_id=customer.id, total=2 * ITEMS)
+    db.session.add(order)
+    db.session.flush()
+    for product in products:
+        db.session.add(Cart(customer_id=customer.id, product_id=product.id, qty=1))
+        db.session.add(OrderDetail(order_id=order.id, product_id=product.id, qty=1, price=2, cost=1))
+    db.session.commit()
+    catalogue_cache.invalidate()
+
+    token = create_access_token(identity=str(customer.id), additional_claims={'role': 'customer'})
+    ids = {'order_id': order.id, 'headers': {'Authorization': f'Bearer {token}'}}
+    # Start each request from an empty identity map, as a real request would
+    db.session.expunge_all()
+    return ids
+
+
+def test_cart_list_budget(client, shop):
+    with query_budget(1):
+        response = client.get('/api/cart/list', headers=shop['headers'])
+    assert len(response.get_json()['cart']) == ITEMS
+
+
+def test_track_order_budget(client, shop):
+    with query_budget(2):
+        response = client.get(f"/order/{shop['order_id']}", headers=shop['headers'])
+    assert len(response.get_json()['order']['details']) == ITEMS
+
+
+def test_admin_order_detail_budget(client, shop, admin_headers):
+    with query_budget(2):
+        response = client.get(f"/admin/order/detail/{shop['order_id']}", headers=admin_headers)
+    assert len(response.get_json()['order']['details']) == ITEMS
+
+
+def test_product_list_budget(client, shop):
+    with query_budget(1):
+        response = client.get('/product/list')
+    assert len(response.get_json()['products']) == ITEMS
+
+
+def test_failed_statement_does_not_leave_a_timing_entry(app):
+    connection = db.session.connection()
+    with pytest.raises(Exception):
+        connection.exec_driver_sql('SELECT * FROM no_such_table')
+    db.session.rollback()
+
+    connection = db.session.connection()
+    connection.exec_driver_sql('SELECT 1')
+    assert connection.info.get('query_started', []) == []
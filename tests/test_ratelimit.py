@@ -0,0 +1,25 @@
+from util.ratelimit import MemoryBuckets
+
+
+def test_refused_request_spends_no_tokens():
+    buckets = MemoryBuckets()
+    ip, identity = ('login:ip:1.2.3.4', 5, 1 / 60), ('login:identity:7', 1, 1 / 60)
+
+    assert buckets.take([ip, identity]) == (True, 0)
+    allowed, retry_after = buckets.take([ip, identity])
+
+    assert not allowed and retry_after > 0
+    # Only the first request took from the address bucket
+    assert buckets._buckets[ip[0]][0] == 4
+
+
+def test_least_recently_used_buckets_are_evicted():
+    buckets = MemoryBuckets(max_keys=2)
+
+    buckets.take([('a', 1, 1 / 60)])
+    buckets.take([('b', 1, 1 / 60)])
+    buckets.take([('c', 1, 1 / 60)])
+
+    assert list(buckets._buckets) == ['b', 'c']
+    # 'a' was forgotten, so it starts again with a full bucket
+    assert buckets.take([('a', 1, 1 / 60)]) == (True, 0)
@@ -0,0 +1,18 @@
+from app import db, catalogue_cache
+from model import Category, Product
+
+
+def test_escaped_query_does_not_share_a_cache_entry(app, client):
+    category = Category(name='Drinks')
+    db.session.add(category)
+    db.session.flush()
+    db.session.add(Product(title='Cola', price=1, cost=1, stock=3, category_id=category.id))
+    db.session.commit()
+    catalogue_cache.invalidate()
+
+    response = client.get('/product/search?q=cola%26x%3D1')
+    assert response.status_code == 200
+    assert response.get_json()['total'] == 0
+
+    response = client.get('/product/search?q=cola&x=1')
+    assert response.get_json()['total'] == 1
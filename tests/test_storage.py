@@ -0,0 +1,81 @@
+import io
+import os
+import time
+
+import pytest
+
+from app import db
+from model import Category, Product
+from util import storage
+
+
+@pytest.fixture
+def upload_folder(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, 'UPLOAD_FOLDER', str(tmp_path))
+    return tmp_path
+
+
+def age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_release_keeps_recently_reused_blob(upload_folder):
+    key = storage.write_blob(io.BytesIO(b'image'), 'png', folder=str(upload_folder))
+    age(upload_folder / key, storage.RELEASE_GRACE + 1)
+
+    # A concurrent upload of the same content reuses the blob before committing
+    assert storage.write_blob(io.BytesIO(b'image'), 'png', folder=str(upload_folder)) == key
+    storage.release_upload(key)
+
+    assert (upload_folder / key).exists()
+
+
+def test_release_removes_old_unreferenced_blob(upload_folder):
+    key = storage.write_blob(io.BytesIO(b'image'), 'png', folder=str(upload_folder))
+    age(upload_folder / key, storage.RELEASE_GRACE + 1)
+
+    storage.release_upload(key)
+
+    assert not (upload_folder / key).exists()
+
+
+def test_failed_write_removes_temp_file(upload_folder):
+    class BrokenStream:
+        def read(self, size):
+            raise OSError('connection reset')
+
+    with pytest.raises(OSError):
+        storage.write_blob(BrokenStream(), 'png', folder=str(upload_folder))
+
+    assert os.listdir(upload_folder) == []
+
+
+def test_sweep_removes_stale_parts_and_unreferenced_blobs(upload_folder):
+    kept = storage.write_blob(io.BytesIO(b'kept'), 'png', folder=str(upload_folder))
+    orphan = storage.write_blob(io.BytesIO(b'orphan'), 'png', folder=str(upload_folder))
+    fresh = storage.write_blob(io.BytesIO(b'fresh'), 'png', folder=str(upload_folder))
+    (upload_folder / 'crashed.part').write_bytes(b'partial')
+    for name in (kept, orphan, 'crashed.part'):
+        age(upload_folder / name, storage.RELEASE_GRACE + 1)
+
+    category = Category(name='Images')
+    db.session.add(category)
+    db.session.flush()
+    db.session.add(Product(title='Kept', price=1, cost=1, stock=1, image=kept, category_id=category.id))
+    db.session.commit()
+
+    assert storage.sweep_uploads() == (1, 1)
+    assert sorted(os.listdir(upload_folder)) == sorted([kept, fresh])
+
+
+def test_release_ignores_keys_outside_the_upload_folder(upload_folder):
+    outside = upload_folder.parent / 'victim_file.txt'
+    outside.write_text('keep me')
+    age(outside, storage.RELEASE_GRACE + 1)
+
+    storage.release_upload('../victim_file.txt')
+    storage.remove_blob('../victim_file.txt')
+    storage.release_upload(str(outside))
+
+    assert outside.exists()
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+PIL = pytest.importorskip('PIL')
+from PIL import Image
+
+from util import thumbnails
+
+
+@pytest.fixture
+def upload_folder(tmp_path, monkeypatch):
+    monkeypatch.setattr(thumbnails, 'UPLOAD_FOLDER', str(tmp_path))
+    Image.new('RGB', (300, 200), 'red').save(tmp_path / 'photo.png')
+    return tmp_path
+
+
+def part_files(folder):
+    return [name for _, _, names in os.walk(folder) for name in names if name.endswith('.part')]
+
+
+def test_generate_variant(upload_folder):
+    path = thumbnails.generate_variant('photo.png', 128)
+
+    with Image.open(path) as variant:
+        assert variant.format == 'WEBP'
+        assert variant.size == (128, 85)
+
+
+def test_decompression_bomb_is_skipped(upload_folder, monkeypatch):
+    monkeypatch.setattr(Image, 'MAX_IMAGE_PIXELS', 100)
+
+    assert thumbnails.generate_variant('photo.png', 128) is None
+
+
+def test_failed_save_removes_temp_file(upload_folder, monkeypatch):
+    def failing_save(self, fp, *args, **kwargs):
+        fp.write(b'partial')
+        raise OSError('disk full')
+    monkeypatch.setattr(Image.Image, 'save', failing_save)
+
+    assert thumbnails.generate_variant('photo.png', 128) is None
+    assert part_files(upload_folder) == []
+
+
+def test_failed_variant_redirects_without_caching(client, upload_folder, monkeypatch):
+    monkeypatch.setattr(thumbnails, 'Image', None)
+
+    response = client.get('/uploads/variants/128/photo.png.webp')
+
+    assert response.status_code == 302
+    assert response.headers['Location'].endswith('/uploads/photo.png')
+    assert 'no-store' in response.headers['Cache-Control']
+    assert 'immutable' not in response.headers['Cache-Control']
@@ -0,0 +1,26 @@
+from functools import wraps
+
+from flask import g, jsonify
+from flask_jwt_extended import get_jwt, jwt_required
+
+
+def current_role():
+    """Role claim of the request's token, read once per request."""
+    if 'jwt_role' not in g:
+        g.jwt_role = get_jwt().get('role')
+    return g.jwt_role
+
+
+def is_admin():
+    return current_role() == 'admin'
+
+
+def admin_required(view):
+    """jwt_required() plus a 403 unless the token carries role=admin."""
+    @wraps(view)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if not is_admin():
+            return jsonify({'message': 'Admin access required'}), 403
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,191 @@
+import bisect
+import re
+import sys
+import threading
+import time
+
+from app import app, db
+from model import Category, Product
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+MAX_KEY_LENGTH = 64
+# Every entry is a (key, kind, id) tuple of the same size
+ENTRY_SIZE = sys.getsizeof(('', '', 0))
+
+
+def normalize(text):
+    return ' '.join(WORD_RE.findall(text.casefold()))
+
+
+def index_keys(label):
+    """One key per word of ``label``, running from that word to the end.
+
+    "Coca-Cola Zero" yields "coca cola zero", "cola zero" and "zero", so a
+    prefix typed from any word start finds the item.
+    """
+    text = normalize(label)
+    return {text[m.start():][:MAX_KEY_LENGTH] for m in WORD_RE.finditer(text)}
+
+
+def item_size(label, keys):
+    """Approximate bytes held by one item's label and its index entries."""
+    return sys.getsizeof(label) + sum(sys.getsizeof(key) + ENTRY_SIZE for key in keys)
+
+
+class PrefixIndex:
+    """Sorted array of ``(key, kind, id)`` tuples searched with bisect.
+
+    Lookups cost one binary search plus a short scan. ``max_entries`` caps
+    the number of keys so memory stays bounded. The approximate size of the
+    keys and labels is kept up to date as entries change, so ``stats()``
+    does not have to walk the index.
+    """
+
+    def __init__(self, max_entries=1_000_000):
+        self.max_entries = max_entries
+        self._entries = []
+        self._labels = {}
+        self._item_bytes = 0
+        self._lock = threading.Lock()
+        self.built_at = None
+        self.truncated = False
+
+    def build(self, items):
+        """Replace the index with ``(kind, id, label)`` items."""
+        labels = {}
+        entries = []
+        item_bytes = 0
+        truncated = False
+        for kind, item_id, label in items:
+            if not label:
+                continue
+            keys = index_keys(label)
+            if len(entries) + len(keys) > self.max_entries:
+                truncated = True
+                break
+            labels[(kind, item_id)] = label
+            entries.extend((key, kind, item_id) for key in keys)
+            item_bytes += item_size(label, keys)
+        entries.sort()
+
+        with self._lock:
+            self._entries = entries
+            self._labels = labels
+            self._item_bytes = item_bytes
+            self.truncated = truncated
+            self.built_at = time.monotonic()
+
+    def _remove(self, kind, item_id):
+        label = self._labels.pop((kind, item_id), None)
+        if label is None:
+            return
+        keys = index_keys(label)
+        self._item_bytes -= item_size(label, keys)
+        for key in keys:
+            position = bisect.bisect_left(self._entries, (key, kind, item_id))
+            if position < len(self._entries) and self._entries[position] == (key, kind, item_id):
+                del self._entries[position]
+
+    def add(self, kind, item_id, label):
+        with self._lock:
+            self._remove(kind, item_id)
+            if not label:
+                return
+            keys = index_keys(label)
+            if len(self._entries) + len(keys) > self.max_entries:
+                self.truncated = True
+                return
+            self._labels[(kind, item_id)] = label
+            self._item_bytes += item_size(label, keys)
+            for key in keys:
+                bisect.insort(self._entries, (key, kind, item_id))
+
+    def remove(self, kind, item_id):
+        with self._lock:
+            self._remove(kind, item_id)
+
+    def suggest(self, prefix, limit=10):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        suggestions = []
+        seen = set()
+        with self._lock:
+            position = bisect.bisect_left(self._entries, (prefix,))
+            while position < len(self._entries) and len(suggestions) < limit:
+                key, kind, item_id = self._entries[position]
+                if not key.startswith(prefix):
+                    break
+                if (kind, item_id) not in seen:
+                    seen.add((kind, item_id))
+                    suggestions.append({
+                        'type': kind,
+                        'id': item_id,
+                        'label': self._labels[(kind, item_id)]
+                    })
+                position += 1
+
+        return suggestions
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'items': len(self._labels),
+                'max_entries': self.max_entries,
+                'truncated': self.truncated,
+                'approx_bytes': (
+                    sys.getsizeof(self._entries) + sys.getsizeof(self._labels) + self._item_bytes
+                ),
+            }
+
+
+autocomplete_index = PrefixIndex(app.config.get('AUTOCOMPLETE_MAX_ENTRIES', 1_000_000))
+_build_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def load_items():
+    for category_id, name in db.session.query(Category.id, Category.name):
+        yield 'category', category_id, name
+    for product_id, title in db.session.query(Product.id, Product.title).yield_per(5000):
+        yield 'product', product_id, title
+
+
+def _refresh():
+    try:
+        with app.app_context():
+            autocomplete_index.build(load_items())
+    finally:
+        _refreshing.clear()
+
+
+def ensure_index():
+    """Build the index on first use and refresh it when it gets old.
+
+    Each worker holds its own copy, updated in place by the admin routes;
+    the periodic rebuild picks up changes made through other workers.
+    """
+    if autocomplete_index.built_at is None:
+        with _build_lock:
+            if autocomplete_index.built_at is None:
+                autocomplete_index.build(load_items())
+        return
+
+    max_age = app.config.get('AUTOCOMPLETE_REFRESH_SECONDS', 300)
+    if time.monotonic() - autocomplete_index.built_at <= max_age:
+        return
+    # Check and set together so concurrent requests start a single refresh
+    with _refresh_lock:
+        if _refreshing.is_set():
+            return
+        _refreshing.set()
+    threading.Thread(target=_refresh, name='autocomplete-refresh', daemon=True).start()
+
+
+def mark_stale():
+    """Force a background rebuild on next use, e.g. after a bulk import."""
+    if autocomplete_index.built_at is not None:
+        autocomplete_index.built_at = float('-inf')
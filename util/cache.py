@@ -0,0 +1,132 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from util.metrics import CACHE_LOOKUPS
+
+
+class MemoryBackend:
+    """Per-process LRU store with a TTL on every entry."""
+
+    def __init__(self, max_entries=256, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Counters live outside the LRU so eviction never resets them
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisBackend:
+    """Store shared by every worker.
+
+    Accepts any client with redis-py's ``get``/``set(ex=)``/``incr`` methods,
+    so a local stand-in can replace a real server.
+    """
+
+    def __init__(self, client, prefix='catalogue:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('The redis package is required for CATALOGUE_CACHE_URL')
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, value, ex=ttl or None)
+
+    def incr(self, key):
+        return self.client.incr(self.prefix + key)
+
+
+class CatalogueCache:
+    """Read-through cache of serialized catalogue responses.
+
+    Entries are keyed by the catalogue version, so ``invalidate()`` makes every
+    cached response stale at once by bumping the version. With the default
+    in-memory backend each worker keeps its own version; configure
+    CATALOGUE_CACHE_URL (or pass a shared CATALOGUE_CACHE_BACKEND) to keep
+    several workers coherent.
+    """
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.ttl = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get('CATALOGUE_CACHE_TTL', 60)
+        backend = app.config.get('CATALOGUE_CACHE_BACKEND')
+        if backend is None:
+            url = app.config.get('CATALOGUE_CACHE_URL')
+            if url:
+                backend = RedisBackend.from_url(url)
+            else:
+                backend = MemoryBackend(
+                    max_entries=app.config.get('CATALOGUE_CACHE_SIZE', 256),
+                    ttl=self.ttl
+                )
+        self.backend = backend
+        app.extensions['catalogue_cache'] = self
+
+    def version(self):
+        return int(self.backend.get('version') or 0)
+
+    def invalidate(self):
+        self.backend.incr('version')
+
+    def get_or_build(self, key, build):
+        """Return ``(status, etag, body)`` for ``key``, calling ``build`` on a miss.
+
+        ``build`` returns ``(status, body)`` with ``body`` as bytes.
+        """
+        cache_key = f'{self.version()}:{key}'
+        cached = self.backend.get(cache_key)
+        if cached is not None:
+            CACHE_LOOKUPS.labels('hit').inc()
+            header, body = cached.split(b'\n', 1)
+            status, etag = header.decode().split(' ', 1)
+            return int(status), etag, body
+
+        CACHE_LOOKUPS.labels('miss').inc()
+        status, body = build()
+        etag = hashlib.sha1(body).hexdigest()
+        self.backend.set(cache_key, f'{status} {etag}\n'.encode() + body, self.ttl)
+        return status, etag, body
@@ -0,0 +1,121 @@
+import random
+import sqlite3
+
+from flask import g, has_request_context, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql.dml import UpdateBase
+
+from util.cache import MemoryBackend, RedisBackend
+
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+def init_sqlite_pragmas(app):
+    """Run the SQLITE_PRAGMAS config on every new SQLite connection."""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+
+    @event.listens_for(Engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+
+def use_primary():
+    """Send the rest of this request to the primary."""
+    if has_request_context():
+        g.pop('db_replica', None)
+        g.db_wrote = True
+
+
+class RoutingSession(Session):
+    """Session that reads from the replica picked for the request.
+
+    Flushes, DML and ``SELECT ... FOR UPDATE`` always go to the primary and
+    pin the rest of the request there, so a request reads its own writes.
+    Outside a request (CLI, background threads) everything uses the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or engine is not self._db.engines.get(None):
+            return engine
+
+        if (
+            self._flushing
+            or isinstance(clause, UpdateBase)
+            or getattr(clause, '_for_update_arg', None) is not None
+        ):
+            use_primary()
+            return engine
+
+        replica = g.get('db_replica') if has_request_context() else None
+        if replica is None:
+            return engine
+        return self._db.engines[replica]
+
+
+class ReplicaRouter:
+    """Picks a replica bind for read-only requests.
+
+    GET/HEAD/OPTIONS requests read from a random bind in REPLICA_BINDS
+    unless the caller wrote something in the last REPLICA_STICKY_SECONDS;
+    callers are the JWT identity, or the client address when anonymous.
+    The sticky marks live in memory per worker unless REPLICA_STICKY_URL
+    (falling back to CATALOGUE_CACHE_URL) points at a shared Redis.
+    """
+
+    def __init__(self, app=None):
+        self.binds = []
+        self.sticky_seconds = 0
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.binds = list(app.config.get('REPLICA_BINDS') or [])
+        self.sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', 5)
+        backend = app.config.get('REPLICA_STICKY_BACKEND')
+        if backend is None:
+            url = app.config.get('REPLICA_STICKY_URL') or app.config.get('CATALOGUE_CACHE_URL')
+            if url:
+                backend = RedisBackend.from_url(url, prefix='replica:')
+            else:
+                backend = MemoryBackend(
+                    max_entries=app.config.get('REPLICA_STICKY_SIZE', 100_000),
+                    ttl=self.sticky_seconds
+                )
+        self.backend = backend
+
+        if self.binds:
+            app.before_request(self.choose_bind)
+            app.after_request(self.remember_write)
+        app.extensions['replica_router'] = self
+
+    def caller(self):
+        try:
+            verify_jwt_in_request(optional=True)
+            identity = get_jwt_identity()
+        except Exception:
+            # Bad tokens are rejected by the view itself
+            identity = None
+        return f'user:{identity}' if identity else f'addr:{request.remote_addr}'
+
+    def choose_bind(self):
+        if request.method not in READ_METHODS:
+            return
+        if self.sticky_seconds and self.backend.get(f'sticky:{self.caller()}') is not None:
+            return
+        g.db_replica = random.choice(self.binds)
+
+    def remember_write(self, response):
+        wrote = request.method not in READ_METHODS or g.get('db_wrote')
+        if wrote and self.sticky_seconds and response.status_code < 400:
+            self.backend.set(f'sticky:{self.caller()}', b'1', self.sticky_seconds)
+        return response
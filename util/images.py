@@ -0,0 +1,46 @@
+from flask import current_app, g, request
+
+# Widths of the resized WebP variants generated for every product image
+VARIANT_WIDTHS = (128, 512, 1024)
+
+
+def storage_key(image):
+    """Reduce a stored image value to its bare key inside the uploads folder.
+
+    Older rows hold absolute URLs (localhost or production) or /uploads/ paths.
+    """
+    if not image:
+        return image
+    if '/uploads/' in image:
+        image = image.split('/uploads/')[-1]
+    return image.lstrip('/')
+
+
+def image_url_prefix():
+    prefix = g.get('image_url_prefix')
+    if prefix is None:
+        base_url = current_app.config.get('IMAGE_BASE_URL')
+        if base_url:
+            prefix = base_url.rstrip('/') + '/'
+        else:
+            prefix = request.host_url + 'uploads/'
+        g.image_url_prefix = prefix
+    return prefix
+
+
+def get_image_url(image):
+    if not image:
+        return None
+    return image_url_prefix() + image
+
+
+def variant_key(image, width):
+    return f'variants/{width}/{image}.webp'
+
+
+def get_image_srcset(image):
+    """Map each variant width descriptor (``'512w'``) to its URL."""
+    if not image:
+        return None
+    prefix = image_url_prefix()
+    return {f'{width}w': prefix + variant_key(image, width) for width in VARIANT_WIDTHS}
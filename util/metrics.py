@@ -0,0 +1,117 @@
+"""Prometheus metrics for the API.
+
+Metric values live in prometheus_client's per-process storage. When several
+gunicorn workers serve the app, point PROMETHEUS_MULTIPROC_DIR at an empty
+directory before they start; /metrics then aggregates every worker's files.
+Call ``mark_worker_dead(worker.pid)`` from gunicorn's ``child_exit`` hook so
+in-flight gauges of dead workers are dropped.
+"""
+import os
+import time
+
+from flask import g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by Flask endpoint',
+    ['endpoint'], buckets=LATENCY_BUCKETS
+)
+REQUESTS = Counter(
+    'http_requests_total', 'Requests by Flask endpoint, method and status',
+    ['endpoint', 'method', 'status']
+)
+IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Requests being handled',
+    ['endpoint'], multiprocess_mode='livesum'
+)
+DB_CONNECTIONS_OPEN = Gauge(
+    'db_pool_connections_open', 'Connections held by the pool',
+    ['bind'], multiprocess_mode='livesum'
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    'db_pool_connections_in_use', 'Connections checked out of the pool',
+    ['bind'], multiprocess_mode='livesum'
+)
+DB_POOL_SIZE = Gauge(
+    'db_pool_size', 'Configured pool size',
+    ['bind'], multiprocess_mode='livesum'
+)
+CACHE_LOOKUPS = Counter(
+    'catalogue_cache_lookups_total', 'Catalogue cache lookups by result',
+    ['result']
+)
+UPLOAD_BYTES = Counter('upload_bytes_total', 'Bytes received in image uploads')
+
+
+def endpoint_label():
+    return request.endpoint or 'unmatched'
+
+
+def init_metrics(app, db):
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_endpoint = endpoint_label()
+        IN_PROGRESS.labels(g.metrics_endpoint).inc()
+
+    @app.after_request
+    def record_request(response):
+        endpoint = g.get('metrics_endpoint') or endpoint_label()
+        started = g.get('metrics_started')
+        if started is not None:
+            REQUEST_LATENCY.labels(endpoint).observe(time.perf_counter() - started)
+        REQUESTS.labels(endpoint, request.method, str(response.status_code)).inc()
+        return response
+
+    @app.teardown_request
+    def finish_request(exc):
+        if 'metrics_endpoint' in g:
+            IN_PROGRESS.labels(g.pop('metrics_endpoint')).dec()
+
+    with app.app_context():
+        for key, engine in db.engines.items():
+            watch_pool(engine, key or 'primary')
+
+
+def watch_pool(engine, bind):
+    open_connections = DB_CONNECTIONS_OPEN.labels(bind)
+    in_use = DB_CONNECTIONS_IN_USE.labels(bind)
+    pool = engine.pool
+    if hasattr(pool, 'size'):
+        DB_POOL_SIZE.labels(bind).set(pool.size())
+
+    @event.listens_for(pool, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        open_connections.inc()
+
+    @event.listens_for(pool, 'close')
+    def on_close(dbapi_connection, connection_record):
+        open_connections.dec()
+
+    @event.listens_for(pool, 'checkout')
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        in_use.inc()
+
+    @event.listens_for(pool, 'checkin')
+    def on_checkin(dbapi_connection, connection_record):
+        in_use.dec()
+
+
+def metrics_response(app):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return app.response_class(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead(pid):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
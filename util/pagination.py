@@ -0,0 +1,42 @@
+import base64
+import json
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def parse_limit(value, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    if value is None or str(value).strip() == "":
+        return default, None
+
+    try:
+        limit = int(value)
+    except (ValueError, TypeError):
+        return None, 'limit must be an integer'
+
+    if limit < 1:
+        return None, 'limit must be greater than 0'
+
+    return min(limit, maximum), None
+
+
+def encode_cursor(*values):
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, size):
+    """Return the cursor values as a list, or None if the token is malformed."""
+    if not token:
+        return None
+
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        return None
+
+    if not isinstance(values, list) or len(values) != size:
+        return None
+
+    return values
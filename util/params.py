@@ -0,0 +1,12 @@
+def parse_bool(value):
+    if value is None:
+        return None
+    value = value.strip().lower()
+    # An empty query value (?in_stock=) means the filter is not set
+    if not value:
+        return None
+    if value in ['true', '1']:
+        return True
+    if value in ['false', '0']:
+        return False
+    raise ValueError(value)
@@ -0,0 +1,86 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import jsonify
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHashingBusy(Exception):
+    """No hashing slot freed up within PASSWORD_HASH_QUEUE_TIMEOUT."""
+
+
+class PasswordHasher:
+    """Runs password hashing on a small process pool.
+
+    Hashing is CPU-bound on purpose, so request threads hand it to
+    PASSWORD_HASH_WORKERS processes and wait. At most
+    PASSWORD_HASH_CONCURRENCY hashes are queued or running per worker
+    process. A request that cannot get a slot within
+    PASSWORD_HASH_QUEUE_TIMEOUT seconds gets a 503 rather than piling up.
+    PASSWORD_HASH_WORKERS = 0 hashes in the request thread.
+    """
+
+    def __init__(self, app=None):
+        self.method = None
+        self.workers = 0
+        self.queue_timeout = None
+        self._slots = None
+        self._method_prefix = None
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', 'scrypt')
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 2)
+        self.queue_timeout = app.config.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5)
+        self._slots = threading.BoundedSemaphore(
+            app.config.get('PASSWORD_HASH_CONCURRENCY', 2 * max(self.workers, 1))
+        )
+        app.register_error_handler(PasswordHashingBusy, self.busy_response)
+        app.extensions['password_hasher'] = self
+
+    def executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    # spawn: forking a threaded server process is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+        return self._executor
+
+    def _run(self, function, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHashingBusy()
+        try:
+            if not self.workers:
+                return function(*args)
+            return self.executor().submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        if not password_hash:
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True when ``password_hash`` was made with other cost parameters."""
+        if self._method_prefix is None:
+            # werkzeug fills in the default cost for a bare "scrypt" or
+            # "pbkdf2"; hash once to see the full parameter string
+            self._method_prefix = self._run(generate_password_hash, '', self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._method_prefix
+
+    def busy_response(self, error):
+        response = jsonify({'message': 'Too many sign-ins in progress, try again shortly'})
+        response.status_code = 503
+        response.headers['Retry-After'] = '1'
+        return response
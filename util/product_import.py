@@ -0,0 +1,163 @@
+import csv
+import io
+import json
+
+from sqlalchemy import insert
+
+from app import db
+from model import Category, Product
+from util.images import storage_key
+from util.storage import is_stored_upload
+
+IMPORT_BATCH_SIZE = 1000
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+class ImportFileError(ValueError):
+    """The file as a whole cannot be read, e.g. it is not UTF-8."""
+
+
+def read_rows(stream, import_format):
+    """Yield ``(row_number, dict)`` pairs from a binary CSV or NDJSON stream.
+
+    Raises ImportFileError when the file is not UTF-8 or not parseable CSV.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    number = 1
+
+    try:
+        if import_format == 'csv':
+            # Row 1 is the header
+            for number, row in enumerate(csv.DictReader(text), 2):
+                yield number, row
+            return
+
+        for number, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, (row if isinstance(row, dict) else None)
+    except UnicodeDecodeError:
+        raise ImportFileError(f'File is not valid UTF-8 text (after row {number})')
+    except csv.Error as e:
+        raise ImportFileError(f'Malformed CSV after row {number}: {e}')
+
+
+def blank(value):
+    return value is None or str(value).strip() == ""
+
+
+def validate_row(row, titles, category_ids, category_names):
+    """Return ``(values, errors)`` for one import row.
+
+    Applies the same rules as create_product against preloaded lookups
+    instead of a query per row.
+    """
+    if row is None:
+        return None, ['row is not a JSON object']
+
+    errors = []
+    values = {}
+
+    title = row.get('title')
+    if blank(title):
+        errors.append('Missing required field: title')
+    else:
+        title = str(title).strip()
+        if title in titles:
+            errors.append(f"A product with the title '{title}' already exists")
+        values['title'] = title
+
+    for field, cast, message in (
+        ('price', float, 'price must be a number'),
+        ('cost', float, 'cost must be a number'),
+        ('stock', int, 'stock must be an integer'),
+    ):
+        value = row.get(field)
+        if blank(value):
+            errors.append(f'Missing required field: {field}')
+            continue
+        try:
+            values[field] = cast(value)
+        except (ValueError, TypeError):
+            errors.append(message)
+
+    category_id = row.get('category_id')
+    category_name = row.get('category')
+    if not blank(category_id):
+        try:
+            category_id = int(category_id)
+        except (ValueError, TypeError):
+            errors.append('category_id must be an integer')
+        else:
+            if category_id in category_ids:
+                values['category_id'] = category_id
+            else:
+                errors.append('Category not found')
+    elif not blank(category_name):
+        category_id = category_names.get(str(category_name).strip())
+        if category_id is None:
+            errors.append('Category not found')
+        else:
+            values['category_id'] = category_id
+    else:
+        errors.append('Missing required field: category_id')
+
+    values['description'] = row.get('description') or None
+    image = row.get('image')
+    if blank(image):
+        values['image'] = None
+    else:
+        # Only files already in the uploads folder; the key is later deleted
+        # from disk when the product is removed
+        image = storage_key(str(image).strip())
+        if is_stored_upload(image):
+            values['image'] = image
+        else:
+            errors.append('image must be the file name of an existing upload')
+
+    return values, errors
+
+
+def import_products(rows, batch_size=IMPORT_BATCH_SIZE, dry_run=False):
+    """Validate and insert ``(row_number, dict)`` rows in executemany batches.
+
+    Valid rows are inserted even when others fail; the caller commits.
+    Returns ``(inserted, errors)`` where ``errors`` lists each rejected row.
+    """
+    titles = {title for title, in db.session.query(Product.title)}
+    category_ids = set()
+    category_names = {}
+    for category_id, name in db.session.query(Category.id, Category.name):
+        category_ids.add(category_id)
+        category_names[name] = category_id
+
+    inserted = 0
+    errors = []
+    batch = []
+
+    for number, row in rows:
+        values, row_errors = validate_row(row, titles, category_ids, category_names)
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+            continue
+
+        # Later rows in the same file must not reuse this title either
+        titles.add(values['title'])
+        batch.append(values)
+
+        if len(batch) >= batch_size:
+            if not dry_run:
+                db.session.execute(insert(Product), batch)
+            inserted += len(batch)
+            batch = []
+
+    if batch:
+        if not dry_run:
+            db.session.execute(insert(Product), batch)
+        inserted += len(batch)
+
+    return inserted, errors
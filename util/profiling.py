@@ -0,0 +1,131 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+MAX_STATEMENT_LENGTH = 1000
+
+# Counters opened by query_budget() in the current context
+_budgets = contextvars.ContextVar('query_budgets', default=())
+
+
+class QueryProfiler:
+    """Counts SQL statements and DB time per request.
+
+    Statements slower than SLOW_QUERY_MS are logged with the endpoint that
+    ran them. In debug mode (or with QUERY_PROFILER_HEADERS) each response
+    carries X-DB-Query-Count and X-DB-Time-Ms; otherwise the numbers are
+    aggregated per endpoint and read with ``stats()``. Queries run while a
+    streamed body is being sent are not included.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.slow_ms = None
+        self.headers = False
+        self._endpoints = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.slow_ms = app.config.get('SLOW_QUERY_MS', 200)
+        self.headers = app.config.get('QUERY_PROFILER_HEADERS', app.debug)
+
+        event.listen(Engine, 'before_cursor_execute', self.before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', self.after_cursor_execute)
+        event.listen(Engine, 'handle_error', self.handle_error)
+        app.after_request(self.after_request)
+        app.extensions['query_profiler'] = self
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append((context, time.perf_counter()))
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()[1]
+
+        for counter in _budgets.get():
+            counter.append(statement)
+
+        endpoint = None
+        if has_request_context():
+            g.db_query_count = g.get('db_query_count', 0) + 1
+            g.db_time = g.get('db_time', 0.0) + elapsed
+            endpoint = request.endpoint
+
+        if self.slow_ms is not None and elapsed * 1000 >= self.slow_ms:
+            self.app.logger.warning(
+                'Slow query (%.1f ms) in %s: %s',
+                elapsed * 1000, endpoint or 'no request', statement[:MAX_STATEMENT_LENGTH]
+            )
+
+    def handle_error(self, exception_context):
+        # after_cursor_execute never runs for a failed statement; drop its
+        # start time so later queries on this pooled connection stay paired
+        conn = exception_context.connection
+        started = conn.info.get('query_started') if conn is not None else None
+        if started and started[-1][0] is exception_context.execution_context:
+            started.pop()
+
+    def after_request(self, response):
+        count = g.get('db_query_count', 0)
+        db_time = g.get('db_time', 0.0)
+
+        if self.headers:
+            response.headers['X-DB-Query-Count'] = str(count)
+            response.headers['X-DB-Time-Ms'] = f'{db_time * 1000:.2f}'
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        with self._lock:
+            totals = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'db_time': 0.0
+            })
+            totals['requests'] += 1
+            totals['queries'] += count
+            totals['max_queries'] = max(totals['max_queries'], count)
+            totals['db_time'] += db_time
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': totals['requests'],
+                    'queries_per_request': round(totals['queries'] / totals['requests'], 2),
+                    'max_queries': totals['max_queries'],
+                    'db_ms_per_request': round(totals['db_time'] * 1000 / totals['requests'], 2),
+                }
+                for endpoint, totals in self._endpoints.items()
+            }
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements executed inside the block into a list."""
+    statements = []
+    token = _budgets.set(_budgets.get() + (statements,))
+    try:
+        yield statements
+    finally:
+        _budgets.reset(token)
+
+
+@contextmanager
+def query_budget(limit):
+    """Fail with AssertionError when the block runs more than ``limit`` statements.
+
+        with query_budget(3):
+            client.get('/api/cart/list', headers=headers)
+    """
+    with count_queries() as statements:
+        yield statements
+    if len(statements) > limit:
+        raise AssertionError(
+            f'{len(statements)} queries exceeded the budget of {limit}:\n' + '\n'.join(statements)
+        )
@@ -0,0 +1,187 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from flask import jsonify, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(limit):
+    """'10/minute' -> (capacity, tokens refilled per second)."""
+    count, period = limit.split('/')
+    count = int(count)
+    return count, count / PERIODS[period.strip()]
+
+
+class MemoryBuckets:
+    """Token buckets held in an LRU-ordered dict, one per worker.
+
+    Once ``max_keys`` buckets exist, the least recently used ones are
+    evicted to make room; an evicted client simply starts with a full bucket.
+    """
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, buckets):
+        """Take one token from every ``(key, capacity, rate)`` bucket, or none.
+
+        Returns ``(allowed, retry_after_seconds)``; a request refused by one
+        bucket leaves the others untouched.
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for key, capacity, rate in buckets:
+                state = self._buckets.get(key)
+                if state is None:
+                    levels.append(capacity)
+                else:
+                    levels.append(min(capacity, state[0] + (now - state[1]) * rate))
+
+            retry_after = max(
+                ((1 - tokens) / rate for tokens, (_, _, rate) in zip(levels, buckets) if tokens < 1),
+                default=0
+            )
+            if retry_after:
+                return False, retry_after
+
+            for tokens, (key, _, _) in zip(levels, buckets):
+                self._buckets[key] = (tokens - 1, now)
+                self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return True, 0
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker, updated atomically by a script.
+
+    Accepts any client with redis-py's ``register_script``, so a local
+    stand-in can replace a real server.
+    """
+
+    # KEYS are the buckets; ARGV is now, then capacity and rate per key
+    SCRIPT = '''
+    local now = tonumber(ARGV[1])
+    local levels = {}
+    local retry_after = 0
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2])
+        local rate = tonumber(ARGV[i * 2 + 1])
+        local state = redis.call('HMGET', key, 'tokens', 'updated')
+        local tokens = tonumber(state[1]) or capacity
+        local updated = tonumber(state[2]) or now
+        tokens = math.min(capacity, tokens + (now - updated) * rate)
+        if tokens < 1 then
+            retry_after = math.max(retry_after, (1 - tokens) / rate)
+        end
+        levels[i] = tokens
+    end
+    if retry_after > 0 then
+        return {0, tostring(retry_after)}
+    end
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[i * 2])
+        local rate = tonumber(ARGV[i * 2 + 1])
+        redis.call('HSET', key, 'tokens', tostring(levels[i] - 1), 'updated', tostring(now))
+        redis.call('EXPIRE', key, math.ceil(capacity / rate) + 1)
+    end
+    return {1, '0'}
+    '''
+
+    def __init__(self, client, prefix='ratelimit:'):
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('The redis package is required for RATELIMIT_STORAGE_URL')
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def take(self, buckets):
+        args = [time.time()]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        allowed, retry_after = self._script(
+            keys=[self.prefix + key for key, _, _ in buckets], args=args
+        )
+        if int(allowed):
+            return True, 0
+        return False, float(retry_after)
+
+
+class RateLimiter:
+    """Per-endpoint token buckets keyed by client address and JWT identity.
+
+    RATE_LIMITS maps endpoint names to ``{'ip': '10/minute',
+    'identity': '5/minute'}``; an identity limit applies only to requests
+    with a valid token. Runs in before_request, so a throttled client gets
+    429 with Retry-After before the view touches the database or the
+    password hasher. Set RATELIMIT_STORAGE_URL to share buckets between
+    workers; behind a proxy, apply ProxyFix so remote_addr is the client.
+    """
+
+    def __init__(self, app=None):
+        self.limits = {}
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.limits = {
+            endpoint: {scope: parse_limit(limit) for scope, limit in scopes.items()}
+            for endpoint, scopes in (app.config.get('RATE_LIMITS') or {}).items()
+        }
+        backend = app.config.get('RATELIMIT_BACKEND')
+        if backend is None:
+            url = app.config.get('RATELIMIT_STORAGE_URL')
+            if url:
+                backend = RedisBuckets.from_url(url)
+            else:
+                backend = MemoryBuckets(app.config.get('RATELIMIT_MAX_KEYS', 100_000))
+        self.backend = backend
+
+        if app.config.get('RATELIMIT_ENABLED', True) and self.limits:
+            app.before_request(self.check)
+        app.extensions['rate_limiter'] = self
+
+    def client_keys(self, scopes):
+        if 'ip' in scopes:
+            yield 'ip', request.remote_addr
+        if 'identity' in scopes:
+            try:
+                verify_jwt_in_request(optional=True)
+                identity = get_jwt_identity()
+            except Exception:
+                # Bad tokens are rejected by the view itself
+                identity = None
+            if identity:
+                yield 'identity', identity
+
+    def check(self):
+        scopes = self.limits.get(request.endpoint)
+        if not scopes:
+            return None
+
+        # Every scope must have a token before any is spent, so a request
+        # refused on identity does not still drain the address bucket
+        buckets = [
+            (f'{request.endpoint}:{scope}:{value}',) + scopes[scope]
+            for scope, value in self.client_keys(scopes)
+        ]
+        allowed, retry_after = self.backend.take(buckets)
+        if not allowed:
+            response = jsonify({'message': 'Too many requests, try again later'})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+            return response
+        return None
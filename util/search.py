@@ -0,0 +1,88 @@
+import re
+
+from sqlalchemy import Float, Integer, and_, func, inspect, literal_column, or_, text
+
+from app import db
+from model import Category, Product
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+MAX_TOKENS = 8
+
+_fts_available = {}
+
+
+def query_tokens(q):
+    return TOKEN_RE.findall(q or '')[:MAX_TOKENS]
+
+
+def sqlite_fts_available():
+    # Databases built with create_all() instead of the migrations have no FTS table
+    url = str(db.engine.url)
+    if url not in _fts_available:
+        _fts_available[url] = inspect(db.engine).has_table('product_fts')
+    return _fts_available[url]
+
+
+def search_products(q, category_id=None, limit=20, offset=0):
+    """Rank products matching every token of ``q`` (each as a prefix).
+
+    Returns ``(rows, total, facets)``: ``rows`` is a page of
+    ``(Product, category name)`` pairs, ``total`` the number of matches in
+    the selected category and ``facets`` the match count per category.
+    """
+    tokens = query_tokens(q)
+    if not tokens:
+        return [], 0, []
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite' and sqlite_fts_available():
+        # bm25 is lower for better matches; title hits weigh ten times more
+        matches = (
+            text(
+                "SELECT rowid AS id, bm25(product_fts, 10.0, 1.0) AS rank "
+                "FROM product_fts WHERE product_fts MATCH :match"
+            )
+            .bindparams(match=' '.join(f'"{t}"*' for t in tokens))
+            .columns(id=Integer, rank=Float)
+            .subquery()
+        )
+        base = db.session.query(Product).join(matches, Product.id == matches.c.id)
+        rank = matches.c.rank
+    elif dialect == 'postgresql':
+        ts_query = func.to_tsquery('simple', ' & '.join(f'{t}:*' for t in tokens))
+        search_vector = literal_column('product.search_vector')
+        base = db.session.query(Product).filter(search_vector.op('@@')(ts_query))
+        rank = -func.ts_rank(search_vector, ts_query)
+    else:
+        base = db.session.query(Product).filter(and_(*[
+            or_(Product.title.ilike(f'%{t}%'), Product.description.ilike(f'%{t}%'))
+            for t in tokens
+        ]))
+        rank = Product.id
+
+    base = base.join(Category, Product.category_id == Category.id)
+
+    facets = [
+        {'category_id': facet_id, 'category': name, 'count': count}
+        for facet_id, name, count in (
+            base.with_entities(Category.id, Category.name, func.count(Product.id))
+            .group_by(Category.id, Category.name)
+            .order_by(func.count(Product.id).desc(), Category.name)
+        )
+    ]
+
+    if category_id is not None:
+        base = base.filter(Product.category_id == category_id)
+        total = sum(f['count'] for f in facets if f['category_id'] == category_id)
+    else:
+        total = sum(f['count'] for f in facets)
+
+    rows = (
+        base.with_entities(Product, Category.name)
+        .order_by(rank, Product.id)
+        .limit(limit)
+        .offset(offset)
+        .all()
+    )
+
+    return rows, total, facets
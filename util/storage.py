@@ -0,0 +1,156 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+
+from werkzeug.security import safe_join
+
+from app import db
+from model import Product
+from util.images import VARIANT_WIDTHS, storage_key, variant_key
+from util.metrics import UPLOAD_BYTES
+
+UPLOAD_FOLDER = os.path.join(os.getcwd(), "uploads")
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+CHUNK_SIZE = 64 * 1024
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+CONTENT_KEY_RE = re.compile(r'^[0-9a-f]{64}\.[a-z0-9]+$')
+
+# A blob written or reused this recently may belong to a product that is not
+# committed yet; release_upload leaves it to sweep_uploads instead
+RELEASE_GRACE = 10 * 60
+
+# Serialises "reuse an existing blob" against "delete an unreferenced blob"
+_blob_lock = threading.Lock()
+
+
+def is_content_key(key):
+    return CONTENT_KEY_RE.match(key) is not None
+
+
+def is_plain_key(key):
+    """True when ``key`` is a bare file name that cannot leave UPLOAD_FOLDER."""
+    return bool(key) and key not in ('.', '..') and os.path.basename(key) == key and '\\' not in key
+
+
+def is_stored_upload(key):
+    """True when ``key`` is a plain file name of a file in UPLOAD_FOLDER."""
+    return is_plain_key(key) and os.path.isfile(os.path.join(UPLOAD_FOLDER, key))
+
+
+def write_blob(stream, extension, folder=None):
+    """Stream ``stream`` to disk and return its content-addressed key.
+
+    The key is ``<sha256>.<extension>``; when a blob with the same content
+    already exists the new copy is discarded and the existing key returned.
+    """
+    folder = folder or UPLOAD_FOLDER
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+
+        key = f"{digest.hexdigest()}.{extension}"
+        path = os.path.join(folder, key)
+        with _blob_lock:
+            if os.path.exists(path):
+                # Refresh the mtime so release_upload treats the blob as in flight
+                os.utime(path)
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return key
+
+
+def save_upload(file_storage):
+    extension = file_storage.filename.rsplit('.', 1)[1].lower()
+    key = write_blob(file_storage.stream, extension)
+    UPLOAD_BYTES.inc(os.path.getsize(os.path.join(UPLOAD_FOLDER, key)))
+    return key
+
+
+def image_in_use(key):
+    return db.session.query(Product.id).filter_by(image=key).first() is not None
+
+
+def blob_paths(key):
+    """Paths of a blob and its variants; none for keys that are not plain names."""
+    if not is_plain_key(key):
+        return []
+    paths = [safe_join(UPLOAD_FOLDER, key)] + [
+        safe_join(UPLOAD_FOLDER, variant_key(key, width)) for width in VARIANT_WIDTHS
+    ]
+    return [path for path in paths if path is not None]
+
+
+def remove_blob(key):
+    for path in blob_paths(key):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def release_upload(image):
+    """Delete an image blob and its variants once no product references it.
+
+    Call after the commit that dropped the reference; the product table is the
+    reference count, so blobs shared by several products survive. Blobs touched
+    within RELEASE_GRACE seconds may be about to gain a reference from a
+    concurrent upload and are left for sweep_uploads.
+    """
+    key = storage_key(image)
+    # Never follow a stored value out of the uploads folder
+    if not is_plain_key(key):
+        return
+
+    with _blob_lock:
+        path = safe_join(UPLOAD_FOLDER, key)
+        if os.path.exists(path) and time.time() - os.path.getmtime(path) < RELEASE_GRACE:
+            return
+        if image_in_use(key):
+            return
+        remove_blob(key)
+
+
+def sweep_uploads(grace=RELEASE_GRACE):
+    """Remove unreferenced content-addressed blobs and stale ``.part`` files.
+
+    Only files older than ``grace`` seconds are considered, so uploads still
+    being written or committed are never touched. Returns (blobs, parts) removed.
+    """
+    cutoff = time.time() - grace
+    referenced = {storage_key(image) for (image,) in db.session.query(Product.image).distinct()}
+
+    parts = 0
+    for folder, _, names in os.walk(UPLOAD_FOLDER):
+        for name in names:
+            path = os.path.join(folder, name)
+            if name.endswith('.part') and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                parts += 1
+
+    blobs = 0
+    for name in os.listdir(UPLOAD_FOLDER):
+        if not is_content_key(name) or name in referenced:
+            continue
+        with _blob_lock:
+            path = os.path.join(UPLOAD_FOLDER, name)
+            if os.path.getmtime(path) < cutoff and not image_in_use(name):
+                remove_blob(name)
+                blobs += 1
+
+    return blobs, parts
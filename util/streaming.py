@@ -0,0 +1,55 @@
+import csv
+import io
+import zlib
+
+from flask import current_app, stream_with_context
+
+CSV_FLUSH_ROWS = 500
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield current_app.json.dumps(row) + '\n'
+
+
+def csv_lines(header, rows):
+    """Yield CSV text in chunks of CSV_FLUSH_ROWS rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for count, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if count % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_response(chunks, mimetype, gzip=False, filename=None):
+    if gzip:
+        chunks = gzip_chunks(chunks)
+
+    response = current_app.response_class(stream_with_context(chunks), mimetype=mimetype)
+    if gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    if filename:
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def ndjson_response(rows):
+    """Stream an iterable of dicts as newline-delimited JSON."""
+    return stream_response(ndjson_lines(rows), 'application/x-ndjson')
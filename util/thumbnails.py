@@ -0,0 +1,79 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app import app
+from util.images import VARIANT_WIDTHS, variant_key
+from util.storage import UPLOAD_FOLDER
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; variants then fall back to the original
+    Image = None
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def variant_path(image, width):
+    return os.path.join(UPLOAD_FOLDER, variant_key(image, width))
+
+
+def generate_variant(image, width):
+    """Write the ``width`` px WebP variant of ``image`` and return its path.
+
+    Returns None when Pillow is missing or the original cannot be read.
+    """
+    path = variant_path(image, width)
+    if os.path.exists(path):
+        return path
+    if Image is None:
+        return None
+
+    source = os.path.join(UPLOAD_FOLDER, image)
+    tmp_path = None
+    try:
+        with Image.open(source) as original:
+            resized = ImageOps.exif_transpose(original)
+            if resized.mode not in ('RGB', 'RGBA'):
+                resized = resized.convert('RGBA' if resized.has_transparency_data else 'RGB')
+            # Never upscale: small originals keep their size
+            resized.thumbnail((width, width * 10))
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+            with os.fdopen(fd, 'wb') as out:
+                resized.save(out, 'WEBP', quality=app.config.get('IMAGE_VARIANT_QUALITY', 80))
+            os.replace(tmp_path, path)
+            tmp_path = None
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        app.logger.warning("Could not generate %spx variant of %s: %s", width, image, e)
+        return None
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path
+
+
+def _generate_all(image):
+    for width in VARIANT_WIDTHS:
+        generate_variant(image, width)
+
+
+def schedule_variants(image):
+    """Generate every variant of ``image`` on the background worker pool."""
+    global _executor
+    if not image or Image is None:
+        return
+    # A deduplicated upload reuses a blob whose variants are already on disk
+    if all(os.path.exists(variant_path(image, width)) for width in VARIANT_WIDTHS):
+        return
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get('IMAGE_VARIANT_WORKERS', 2),
+                thread_name_prefix='image-variants'
+            )
+    _executor.submit(_generate_all, image)
@@ -0,0 +1,177 @@
+import hashlib
+import heapq
+import math
+import threading
+import time
+
+
+def member_key(member):
+    # JTIs are 36-character UUID strings; a 16-byte digest halves the footprint
+    return hashlib.blake2b(member.encode(), digest_size=16).digest()
+
+
+class ExpiringSet:
+    """In-process set whose members drop out at their expiry time.
+
+    ``expires_at`` is a Unix timestamp, e.g. a JWT's ``exp`` claim, so the
+    set never holds tokens that could no longer be presented anyway.
+    """
+
+    def __init__(self):
+        self._expiry = {}
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def _prune(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._expiry.get(key) == expires_at:
+                del self._expiry[key]
+
+    def add(self, member, expires_at):
+        """Add ``member``; return False if it was already present."""
+        key = member_key(member)
+        with self._lock:
+            self._prune(time.time())
+            if key in self._expiry:
+                return False
+            self._expiry[key] = expires_at
+            heapq.heappush(self._heap, (expires_at, key))
+            self._added(key)
+            return True
+
+    def _added(self, key):
+        pass
+
+    def __contains__(self, member):
+        with self._lock:
+            expires_at = self._expiry.get(member_key(member))
+        return expires_at is not None and expires_at > time.time()
+
+    def __len__(self):
+        with self._lock:
+            self._prune(time.time())
+            return len(self._expiry)
+
+
+class BloomFilter:
+    """Bit array answering "definitely absent" without touching the set.
+
+    Takes the 16-byte keys from ``member_key``; its two halves seed the
+    double hashing, so no further hashing is done per probe.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        position = int.from_bytes(key[:8], 'little') % self.size
+        step = (int.from_bytes(key[8:], 'little') | 1) % self.size
+        for _ in range(self.hashes):
+            yield position
+            position = (position + step) % self.size
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        # Inlined probe loop; most absent keys stop at the first clear bit
+        bits = self.bits
+        size = self.size
+        position = int.from_bytes(key[:8], 'little') % size
+        step = (int.from_bytes(key[8:], 'little') | 1) % size
+        for _ in range(self.hashes):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            position = (position + step) % size
+        return True
+
+
+class BloomExpiringSet(ExpiringSet):
+    """ExpiringSet with a Bloom filter in front of lookups.
+
+    Most lookups are for members that were never added (a denylist is
+    checked on every request), and those are answered from the filter. The
+    filter cannot forget, so it is rebuilt from the live members once half
+    of what it holds has expired, growing when the set outgrows it.
+    """
+
+    def __init__(self, capacity=100_000, error_rate=0.01):
+        super().__init__()
+        self.error_rate = error_rate
+        self.bloom = BloomFilter(capacity, error_rate)
+
+    def _rebuild(self):
+        capacity = self.bloom.capacity
+        while len(self._expiry) * 2 > capacity:
+            capacity *= 2
+        bloom = BloomFilter(capacity, self.error_rate)
+        for key in self._expiry:
+            bloom.add(key)
+        self.bloom = bloom
+
+    def _prune(self, now):
+        super()._prune(now)
+        count = self.bloom.count
+        if count >= self.bloom.capacity or (count * 2 >= self.bloom.capacity and len(self._expiry) * 2 < count):
+            self._rebuild()
+
+    def _added(self, key):
+        self.bloom.add(key)
+
+    def __contains__(self, member):
+        if member_key(member) not in self.bloom:
+            return False
+        return super().__contains__(member)
+
+
+class RedisExpiringSet:
+    """ExpiringSet shared by every worker, one key per member.
+
+    Accepts any client with redis-py's ``set(nx=, ex=)`` and ``exists``, so
+    a local stand-in can replace a real server.
+    """
+
+    def __init__(self, client, prefix='tokens:'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('The redis package is required for TOKEN_STORE_URL')
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def add(self, member, expires_at):
+        ttl = max(1, int(expires_at - time.time()))
+        return bool(self.client.set(self.prefix + member, 1, nx=True, ex=ttl))
+
+    def __contains__(self, member):
+        return bool(self.client.exists(self.prefix + member))
+
+
+def expiring_set(app, name, bloom=False):
+    """ExpiringSet for ``name``.
+
+    TOKEN_STORE (a callable taking ``name`` and returning an object with
+    ``add``/``__contains__``) or TOKEN_STORE_URL make it shared across
+    workers. A local Bloom filter cannot see members
+    added by other workers, so ``bloom`` only applies to the in-process set.
+    """
+    store = app.config.get('TOKEN_STORE')
+    if store is not None:
+        return store(name)
+    url = app.config.get('TOKEN_STORE_URL')
+    if url:
+        return RedisExpiringSet.from_url(url, prefix=f'{name}:')
+    if bloom:
+        return BloomExpiringSet(app.config.get('TOKEN_DENYLIST_CAPACITY', 100_000))
+    return ExpiringSet()